@@ -17,11 +17,11 @@ def get_pipeline_status(jenkins_service: JenkinsService) -> str:
         jobs = jenkins_service.get_jobs()
 
         # Count pipeline types
-        freestyle_count = len([j for j in jobs if j.get("_class") == "hudson.model.FreeStyleProject"])
-        workflow_count = len([j for j in jobs if j.get("_class") == "org.jenkinsci.plugins.workflow.job.WorkflowJob"])
+        freestyle_count = sum(1 for j in jobs if j.get("_class") == "hudson.model.FreeStyleProject")
+        workflow_count = sum(1 for j in jobs if j.get("_class") == "org.jenkinsci.plugins.workflow.job.WorkflowJob")
 
         # Count by status
-        enabled_count = len([j for j in jobs if not j.get("disabled", False)])
+        enabled_count = sum(1 for j in jobs if not j.get("disabled", False))
         disabled_count = len(jobs) - enabled_count
 
         status = {
@@ -80,10 +80,10 @@ def get_pipeline_dashboard(jenkins_service: JenkinsService) -> str:
         jobs = jenkins_service.get_jobs()
         dashboard_data = {
             "total_pipelines": len(jobs),
-            "enabled_pipelines": len([j for j in jobs if not j.get("disabled", False)]),
-            "disabled_pipelines": len([j for j in jobs if j.get("disabled", False)]),
-            "freestyle_pipelines": len([j for j in jobs if j.get("_class") == "hudson.model.FreeStyleProject"]),
-            "workflow_pipelines": len([j for j in jobs if j.get("_class") == "org.jenkinsci.plugins.workflow.job.WorkflowJob"]),
+            "enabled_pipelines": sum(1 for j in jobs if not j.get("disabled", False)),
+            "disabled_pipelines": sum(1 for j in jobs if j.get("disabled", False)),
+            "freestyle_pipelines": sum(1 for j in jobs if j.get("_class") == "hudson.model.FreeStyleProject"),
+            "workflow_pipelines": sum(1 for j in jobs if j.get("_class") == "org.jenkinsci.plugins.workflow.job.WorkflowJob"),
             "pipelines": [
                 {
                     "name": job["name"],
@@ -125,8 +125,8 @@ def get_overall_health(jenkins_service: JenkinsService) -> str:
 
         # Calculate health metrics
         total_jobs = len(jobs)
-        enabled_jobs = len([j for j in jobs if not j.get("disabled", False)])
-        failed_jobs = len([j for j in jobs if j.get("lastBuild", {}).get("result") == "FAILURE"])
+        enabled_jobs = sum(1 for j in jobs if not j.get("disabled", False))
+        failed_jobs = sum(1 for j in jobs if j.get("lastBuild", {}).get("result") == "FAILURE")
 
         health_data = {
             "overall_health": "GOOD" if failed_jobs < total_jobs * 0.1 else "WARNING" if failed_jobs < total_jobs * 0.3 else "CRITICAL",
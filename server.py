@@ -161,6 +161,11 @@ async def predict_pipeline_failure(pipeline_name: str, ctx: Context) -> dict[str
     """AI prediction of likely pipeline failures based on patterns."""
     return await ai_tools.predict_pipeline_failure(pipeline_name, ctx)
 
+@mcp.tool
+async def predict_pipeline_failures(pipeline_names: list[str], ctx: Context) -> list[dict[str, Any]]:
+    """AI prediction of failure risk for several pipelines at once."""
+    return await ai_tools.predict_pipeline_failures(pipeline_names, ctx)
+
 @mcp.tool
 async def suggest_pipeline_optimization(pipeline_name: str, ctx: Context) -> list[dict[str, str]]:
     """AI suggestions for optimizing pipeline performance."""
@@ -1,15 +1,40 @@
 """Advanced Security & Compliance Tools for Jenkins Pipeline Intelligence."""
 
-import hashlib
 import logging
-import re
 from datetime import datetime
 from typing import Any
 
 from fastmcp import Context
 
+from utils.sanitizer import detect_sensitive_data, protect_identifying_names
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Keys whose string values come from this module's own closed vocabulary and never
+# carry user data, so they skip sensitive-data detection. pipeline_name is not one.
+_SAFE_KEYS = frozenset({
+    'severity', 'issue', 'description', 'data_source', 'audit_timestamp',
+    'authorization_matrix', 'build_token', 'scm_access', 'credentials',
+    'password_params', 'scm_trigger', 'password_masking',
+})
+
+
+def _fast_str(obj: Any) -> str:
+    """Return a string form of a config subtree for substring checks, using orjson when available."""
+    if isinstance(obj, str):
+        return obj
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            pass
+    return str(obj)
+
 
 class AdvancedSecurityTools:
     """Advanced security and compliance tools for Jenkins pipelines."""
@@ -19,75 +44,11 @@ class AdvancedSecurityTools:
 
     def _detect_sensitive_data(self, text: str) -> str:
         """Detect and hash sensitive data for AI communication while keeping real data locally."""
-        if not text:
-            return text
-
-        # Patterns for sensitive data
-        patterns = {
-            'password': r'(?i)(password|passwd|pwd)\s*[:=]\s*["\']?([^"\'\s]{3,})["\']?',
-            'token': r'(?i)(token|bearer|api[_-]?key)\s*[:=]\s*["\']?([a-zA-Z0-9._-]{10,})["\']?',
-            'secret': r'(?i)(secret|key)\s*[:=]\s*["\']?([a-zA-Z0-9._-]{10,})["\']?',
-            'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            'ip': r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b',
-            'url': r'https?://[^\s<>"{}|\\^`\[\]]+',
-            'pipeline_name': r'\b(?:pipeline|job|build)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'cluster_name': r'\b(?:cluster|eks|gke|aks)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'environment': r'\b(?:env|environment)\s*[:=]\s*["\']?(prod|production|staging|stage|dev|development|test|qa|uat)["\']?',
-            'project_name': r'\b(?:project|repo|repository)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'namespace': r'\b(?:namespace|ns)\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'service_name': r'\b(?:service|svc)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'user_name': r'\b(?:user|username)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'team_name': r'\b(?:team|group)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'company_name': r'\b(?:company|org|organization)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-        }
-
-        protected_text = text
-        for pattern_name, pattern in patterns.items():
-            matches = re.finditer(pattern, protected_text)
-            for match in matches:
-                if match.group(2) if len(match.groups()) > 1 else match.group(0):
-                    sensitive_value = match.group(2) if len(match.groups()) > 1 else match.group(0)
-                    # Create a hash for AI communication
-                    hash_value = hashlib.sha256(sensitive_value.encode()).hexdigest()[:8]
-                    protected_text = protected_text.replace(sensitive_value, f"[{pattern_name.upper()}_HASH_{hash_value}]")
-
-        # Also protect identifying names
-        protected_text = self._protect_identifying_names(protected_text)
-
-        return protected_text
+        return detect_sensitive_data(text)
 
     def _protect_identifying_names(self, text: str) -> str:
         """Protect identifying names like pipeline names, cluster names, etc."""
-        if not text:
-            return text
-
-        # Common naming patterns that might contain sensitive information
-        name_patterns = {
-            'pipeline_name': r'\b(?:eks|gke|aks|k8s|kube)[-_]?[a-zA-Z0-9]{2,}\b',  # eks-prod, gke-staging, etc.
-            'cluster_name': r'\b(?:cluster|eks|gke|aks)[-_]?[a-zA-Z0-9]{2,}\b',  # cluster-prod, eks-dev, etc.
-            'environment_name': r'\b(?:prod|production|staging|stage|dev|development|test|qa|uat)[-_]?[a-zA-Z0-9]{0,}\b',
-            'project_name': r'\b(?:project|repo|app)[-_]?[a-zA-Z0-9]{2,}\b',  # project-abc, repo-xyz, etc.
-            'service_name': r'\b(?:svc|service)[-_]?[a-zA-Z0-9]{2,}\b',  # svc-api, service-web, etc.
-            'team_name': r'\b(?:team|group)[-_]?[a-zA-Z0-9]{2,}\b',  # team-devops, group-backend, etc.
-            'company_name': r'\b(?:company|org|corp)[-_]?[a-zA-Z0-9]{2,}\b',  # company-abc, org-xyz, etc.
-            'folder_name': r'\b(?:folder|dir|directory)[-_]?[a-zA-Z0-9]{2,}\b',  # folder-abc, dir-xyz, etc.
-            'app_name': r'\b(?:app|application)[-_]?[a-zA-Z0-9]{2,}\b',  # app-web, application-api, etc.
-            'branch_name': r'\b(?:branch|br)[-_]?[a-zA-Z0-9]{2,}\b',  # branch-feature, br-main, etc.
-            'org_name': r'\b(?:org|organization)[-_]?[a-zA-Z0-9]{2,}\b',  # org-company, organization-abc, etc.
-            'repo_name': r'\b(?:repo|repository)[-_]?[a-zA-Z0-9]{2,}\b',  # repo-backend, repository-frontend, etc.
-            'file_name': r'\b(?:file|src|lib)[-_]?[a-zA-Z0-9]{2,}\.(?:py|js|ts|java|go|rs|cpp|c|h|hpp|cs|php|rb|swift|kt|scala|sh|bash|ps1|yaml|yml|json|xml|html|css|sql|md|txt)\b',  # file-utils.py, src-main.js, etc.
-        }
-
-        protected_text = text
-        for pattern_name, pattern in name_patterns.items():
-            matches = re.finditer(pattern, protected_text)
-            for match in matches:
-                name_value = match.group(0)
-                # Create a hash for AI communication
-                hash_value = hashlib.sha256(name_value.encode()).hexdigest()[:8]
-                protected_text = protected_text.replace(name_value, f"[{pattern_name.upper()}_HASH_{hash_value}]")
-
-        return protected_text
+        return protect_identifying_names(text)
 
     def _protect_sensitive_data_in_dict(self, data: dict[str, Any]) -> dict[str, Any]:
         """Recursively protect sensitive data in dictionaries and lists."""
@@ -95,7 +56,7 @@ class AdvancedSecurityTools:
             protected = {}
             for key, value in data.items():
                 if isinstance(value, str):
-                    protected[key] = self._detect_sensitive_data(value)
+                    protected[key] = value if key in _SAFE_KEYS else self._detect_sensitive_data(value)
                 elif isinstance(value, dict | list):
                     protected[key] = self._protect_sensitive_data_in_dict(value)
                 else:
@@ -133,10 +94,10 @@ class AdvancedSecurityTools:
 
             # Check for explicit permissions in pipeline config
             if "properties" in config:
-                properties = config["properties"]
+                properties = _fast_str(config["properties"])
 
                 # Check for authorization matrix
-                if "hudson.security.AuthorizationMatrixProperty" in str(properties):
+                if "hudson.security.AuthorizationMatrixProperty" in properties:
                     permission_analysis["permissions"]["authorization_matrix"] = "configured"
                 else:
                     permission_analysis["permissions"]["authorization_matrix"] = "not_configured"
@@ -147,7 +108,7 @@ class AdvancedSecurityTools:
                     })
 
                 # Check for build permissions
-                if "hudson.model.BuildAuthorizationToken" in str(properties):
+                if "hudson.model.BuildAuthorizationToken" in properties:
                     permission_analysis["permissions"]["build_token"] = "configured"
                 else:
                     permission_analysis["permissions"]["build_token"] = "not_configured"
@@ -183,8 +144,8 @@ class AdvancedSecurityTools:
 
             # Check for parameter security
             if "parametersDefinitionProperty" in config:
-                params = config["parametersDefinitionProperty"]
-                if "passwordParameterDefinition" in str(params):
+                params = _fast_str(config["parametersDefinitionProperty"])
+                if "passwordParameterDefinition" in params:
                     permission_analysis["permissions"]["password_params"] = "configured"
                     permission_analysis["security_issues"].append({
                         "severity": "high",
@@ -196,8 +157,8 @@ class AdvancedSecurityTools:
 
             # Check for build triggers security
             if "triggers" in config:
-                triggers = config["triggers"]
-                if "hudson.triggers.SCMTrigger" in str(triggers):
+                triggers = _fast_str(config["triggers"])
+                if "hudson.triggers.SCMTrigger" in triggers:
                     permission_analysis["permissions"]["scm_trigger"] = "configured"
                     permission_analysis["security_issues"].append({
                         "severity": "medium",
@@ -1,12 +1,85 @@
 """AI-powered intelligence tools."""
 
+import asyncio
+import logging
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
 from datetime import datetime
+from types import MappingProxyType
 from typing import Any
 
+import numpy as np
 from fastmcp import Context
 
 from services.jenkins_service import JenkinsService
-from utils import format_duration_seconds
+from utils import ctx_info, format_duration_seconds, parse_timestamp_epoch
+
+logger = logging.getLogger(__name__)
+
+# Short-lived cache of Jenkins responses so back-to-back tool calls on the
+# same pipeline reuse one HTTP round-trip.
+_CACHE_MAX_SIZE = 32
+_CACHE_TTL_SECONDS = 30.0
+
+# Jenkins results are interned by JenkinsService.get_builds, so == against this
+# constant resolves on the identity check
+_FAILURE = sys.intern("FAILURE")
+
+# Build attributes the analyses read; everything else is left out of the Jenkins response
+_BUILD_FIELDS = ("number", "result", "duration", "timestamp")
+
+# Risk bands as (lower bound, level, recommendation), looked up with bisect
+_RISK_BANDS = (
+    (0, "LOW", "Pipeline appears stable. Continue monitoring."),
+    (40, "MEDIUM", "Monitor closely. Review recent changes and consider implementing better error handling."),
+    (70, "HIGH", "Immediate attention required. Consider pausing pipeline and investigating root causes."),
+)
+_RISK_THRESHOLDS = tuple(band[0] for band in _RISK_BANDS[1:])
+
+# Recent failure rate (percent, exclusive bounds) -> (risk factor, score)
+_FAILURE_RATE_THRESHOLDS = (15, 30)
+_FAILURE_RATE_RISKS = (
+    None,
+    ("Moderate recent failure rate", 20),
+    ("High recent failure rate", 40),
+)
+
+# Leading failure streak (inclusive bounds) -> score
+_STREAK_THRESHOLDS = (2, 3)
+_STREAK_SCORES = (0, 15, 30)
+
+
+# Suggestion included in every optimization response
+_GENERIC_SUGGESTION = MappingProxyType({
+    "category": "Best Practices",
+    "priority": "Low",
+    "suggestion": "Add pipeline health checks and monitoring",
+    "reason": "Proactive monitoring helps prevent issues",
+})
+
+
+def _clamp(value: int, upper: int = 100) -> int:
+    """Cap an integer score at ``upper``."""
+    return value if value < upper else upper
+
+
+@dataclass(slots=True)
+class BuildStats:
+    """Aggregated statistics over a window of recent builds."""
+
+    count: int
+    failures: int
+    consecutive_failures: int
+    duration_count: int
+    avg_duration: float
+    max_duration: float
+    time_span_hours: float | None
 
 
 class AITools:
@@ -14,136 +87,259 @@ class AITools:
 
     def __init__(self, jenkins_service: JenkinsService):
         self.jenkins = jenkins_service
-
-    def _parse_timestamp(self, timestamp_str: str) -> datetime:
-        """Safely parse timestamp string to datetime object."""
-        if not timestamp_str:
-            return datetime.now()
-        
-        try:
-            # Handle different timestamp formats
-            if isinstance(timestamp_str, (int, float)):
-                return datetime.fromtimestamp(timestamp_str / 1000)
-            elif isinstance(timestamp_str, str):
-                # Try different formats
-                for fmt in ['%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d %H:%M:%S']:
-                    try:
-                        return datetime.strptime(timestamp_str, fmt)
-                    except ValueError:
-                        continue
-                # If all formats fail, return current time
-                return datetime.now()
-        except Exception:
-            return datetime.now()
+        self._builds_cache: OrderedDict[str, tuple[float, int, list[dict[str, Any]]]] = OrderedDict()
+        self._job_info_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._analysis_date_cache: tuple[int, str] = (0, "")
+        # Jenkins fetches run in worker threads, so cache updates are serialized
+        self._cache_lock = threading.Lock()
+
+    def _analysis_date(self) -> str:
+        """Current local time in ISO format, reformatted at most once per second."""
+        now = int(time.time())
+        if now != self._analysis_date_cache[0]:
+            self._analysis_date_cache = (now, datetime.fromtimestamp(now).isoformat(timespec="seconds"))
+        return self._analysis_date_cache[1]
+
+    def _cache_get(self, cache: OrderedDict, key: Hashable) -> tuple | None:
+        """Return a fresh cache entry (without its timestamp) and mark it recently used."""
+        with self._cache_lock:
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= _CACHE_TTL_SECONDS:
+                del cache[key]
+                return None
+            cache.move_to_end(key)
+            return entry[1:]
+
+    def _cache_put(self, cache: OrderedDict, key: Hashable, *values: Any) -> None:
+        """Store an entry, evicting the least recently used one on overflow."""
+        with self._cache_lock:
+            cache[key] = (time.monotonic(), *values)
+            cache.move_to_end(key)
+            if len(cache) > _CACHE_MAX_SIZE:
+                cache.popitem(last=False)
+
+    def _cached_get_builds(self, pipeline_name: str, limit: int) -> list[dict[str, Any]]:
+        """Get recent builds, slicing a fresh cached fetch when it already covers ``limit``."""
+        entry = self._cache_get(self._builds_cache, pipeline_name)
+        if entry is not None:
+            fetched_limit, builds = entry
+            # A short list means the pipeline has no more builds than we already hold
+            if fetched_limit >= limit or len(builds) < fetched_limit:
+                return builds[:limit]
+
+        builds = self.jenkins.get_builds(pipeline_name, limit, fields=_BUILD_FIELDS)
+        self._cache_put(self._builds_cache, pipeline_name, limit, builds)
+        return builds
+
+    def _cached_get_job_info(self, pipeline_name: str) -> dict[str, Any]:
+        """Get job information, reusing a fresh cached response."""
+        entry = self._cache_get(self._job_info_cache, pipeline_name)
+        if entry is not None:
+            return entry[0]
+
+        job_info = self.jenkins.get_job_info(pipeline_name)
+        self._cache_put(self._job_info_cache, pipeline_name, job_info)
+        return job_info
+
+    @staticmethod
+    def _analyze_builds(builds: list[dict[str, Any]]) -> BuildStats:
+        """Compute failure, streak, duration and time-span statistics for a window of builds."""
+        # Result column as compact 0/1 ints so both failure reductions run over C values
+        is_failure = array('b', [build.get("result") == _FAILURE for build in builds])
+        failures = sum(is_failure)
+        consecutive_failures = 0
+        for failed in is_failure[:5]:
+            if not failed:
+                break
+            consecutive_failures += 1
+
+        total_duration = 0.0
+        max_duration = 0.0
+        duration_count = 0
+        for build in builds:
+            if build.get("duration"):
+                duration = format_duration_seconds(build["duration"])
+                total_duration += duration
+                duration_count += 1
+                if duration > max_duration:
+                    max_duration = duration
+
+        time_span_hours = None
+        if len(builds) > 1:
+            newest = parse_timestamp_epoch(builds[0].get("timestamp"))
+            oldest = parse_timestamp_epoch(builds[-1].get("timestamp"))
+            if newest is not None and oldest is not None:
+                time_span_hours = (newest - oldest) / 3600.0
+
+        return BuildStats(
+            count=len(builds),
+            failures=failures,
+            consecutive_failures=consecutive_failures,
+            duration_count=duration_count,
+            avg_duration=total_duration / duration_count if duration_count else 0.0,
+            max_duration=max_duration,
+            time_span_hours=time_span_hours,
+        )
 
     async def predict_pipeline_failure(self, pipeline_name: str, ctx: Context) -> dict[str, Any]:
         """AI prediction of likely pipeline failures based on patterns."""
-        await ctx.info(f"Predicting failure risk for pipeline: {pipeline_name}")
+        await ctx_info(ctx, logger, "Predicting failure risk for pipeline: %s", pipeline_name)
 
         if not self.jenkins.is_initialized():
             await ctx.error("Jenkins not initialized. Please configure Jenkins connection first.")
             raise ValueError("Jenkins not initialized. Please configure Jenkins connection first.")
 
         try:
-            await ctx.info("Analyzing historical patterns...")
-            builds = self.jenkins.get_builds(pipeline_name, 50)
+            await ctx_info(ctx, logger, "Analyzing historical patterns...")
+            recent_builds = await asyncio.to_thread(self._cached_get_builds, pipeline_name, 20)
 
-            if len(builds) < 10:
+            if len(recent_builds) < 10:
                 return {"error": "Insufficient data for prediction (need at least 10 builds)"}
 
             # Analyze recent patterns
-            recent_builds = builds[:20]
-            failure_count = len([b for b in recent_builds if b.get("result") == "FAILURE"])
-            failure_rate = (failure_count / len(recent_builds)) * 100
+            stats = self._analyze_builds(recent_builds)
+            failure_rate = (stats.failures / stats.count) * 100
+            consecutive_failures = stats.consecutive_failures
 
             # Calculate risk factors
             risk_factors = []
             risk_score = 0
 
-            if failure_rate > 30:
-                risk_factors.append("High recent failure rate")
-                risk_score += 40
-            elif failure_rate > 15:
-                risk_factors.append("Moderate recent failure rate")
-                risk_score += 20
+            failure_rate_risk = _FAILURE_RATE_RISKS[bisect_left(_FAILURE_RATE_THRESHOLDS, failure_rate)]
+            if failure_rate_risk:
+                risk_factors.append(failure_rate_risk[0])
+                risk_score += failure_rate_risk[1]
 
             # Check for consecutive failures
-            consecutive_failures = 0
-            for build in recent_builds[:5]:
-                if build.get("result") == "FAILURE":
-                    consecutive_failures += 1
-                else:
-                    break
-
-            if consecutive_failures >= 3:
+            streak_score = _STREAK_SCORES[bisect_right(_STREAK_THRESHOLDS, consecutive_failures)]
+            if streak_score:
                 risk_factors.append(f"{consecutive_failures} consecutive failures")
-                risk_score += 30
-            elif consecutive_failures >= 2:
-                risk_factors.append(f"{consecutive_failures} consecutive failures")
-                risk_score += 15
+                risk_score += streak_score
 
             # Check build frequency (too frequent might indicate instability)
-            if len(recent_builds) > 1:
-                try:
-                    time_span = (self._parse_timestamp(recent_builds[0].get("timestamp")) -
-                                self._parse_timestamp(recent_builds[-1].get("timestamp"))).total_seconds() / 3600
-                    builds_per_hour = len(recent_builds) / time_span if time_span > 0 else 0
-                except Exception:
-                    builds_per_hour = 0
-
-                if builds_per_hour > 2:
-                    risk_factors.append("Very high build frequency")
-                    risk_score += 10
-
-            # Determine risk level
-            if risk_score >= 70:
-                risk_level = "HIGH"
-                recommendation = "Immediate attention required. Consider pausing pipeline and investigating root causes."
-            elif risk_score >= 40:
-                risk_level = "MEDIUM"
-                recommendation = "Monitor closely. Review recent changes and consider implementing better error handling."
-            else:
-                risk_level = "LOW"
-                recommendation = "Pipeline appears stable. Continue monitoring."
-
-            prediction = {
-                "pipeline_name": pipeline_name,
-                "risk_level": risk_level,
-                "risk_score": min(risk_score, 100),
-                "failure_probability": min(failure_rate + (risk_score * 0.3), 100),
-                "risk_factors": risk_factors,
-                "recommendation": recommendation,
-                "analysis_date": datetime.now().isoformat(),
-                "builds_analyzed": len(recent_builds)
-            }
-
-            await ctx.info(f"Prediction complete: {risk_level} risk level")
+            # (more than 2 builds/hour, compared without dividing)
+            time_span = stats.time_span_hours
+            if stats.count > 1 and time_span is not None and time_span > 0 and stats.count > 2 * time_span:
+                risk_factors.append("Very high build frequency")
+                risk_score += 10
+
+            prediction = self._build_prediction(pipeline_name, risk_score, failure_rate, risk_factors, stats.count)
+
+            await ctx_info(ctx, logger, "Prediction complete: %s risk level", prediction["risk_level"])
             return prediction
 
         except Exception as e:
             await ctx.error(f"Error predicting failure for {pipeline_name}: {str(e)}")
             raise
 
+    async def predict_pipeline_failures(self, pipeline_names: list[str], ctx: Context) -> list[dict[str, Any]]:
+        """AI prediction of failure risk for several pipelines in one vectorized pass."""
+        await ctx_info(ctx, logger, "Predicting failure risk for %d pipelines", len(pipeline_names))
+
+        if not self.jenkins.is_initialized():
+            await ctx.error("Jenkins not initialized. Please configure Jenkins connection first.")
+            raise ValueError("Jenkins not initialized. Please configure Jenkins connection first.")
+
+        try:
+            await ctx_info(ctx, logger, "Analyzing historical patterns...")
+            build_lists = await asyncio.gather(*(
+                asyncio.to_thread(self._cached_get_builds, name, 20) for name in pipeline_names
+            ))
+
+            predictions: list[dict[str, Any]] = [
+                {"pipeline_name": name, "error": "Insufficient data for prediction (need at least 10 builds)"}
+                for name in pipeline_names
+            ]
+            eligible = [i for i, builds in enumerate(build_lists) if len(builds) >= 10]
+            if not eligible:
+                return predictions
+
+            # One row per pipeline, one column per build (newest first); padding counts as not failed
+            counts = np.array([len(build_lists[i]) for i in eligible])
+            failed = np.zeros((len(eligible), counts.max()), dtype=bool)
+            time_spans = np.full(len(eligible), np.nan)
+            for row, i in enumerate(eligible):
+                builds = build_lists[i]
+                failed[row, :len(builds)] = np.fromiter(
+                    (b.get("result") == _FAILURE for b in builds), dtype=bool, count=len(builds)
+                )
+                newest = parse_timestamp_epoch(builds[0].get("timestamp"))
+                oldest = parse_timestamp_epoch(builds[-1].get("timestamp"))
+                if newest is not None and oldest is not None:
+                    time_spans[row] = (newest - oldest) / 3600.0
+
+            failure_rates = failed.sum(axis=1) * 100.0 / counts
+            consecutive_failures = failed[:, :5].cumprod(axis=1).sum(axis=1)
+            # More than 2 builds/hour; NaN spans compare False
+            high_frequency = (time_spans > 0) & (counts > 2 * time_spans)
+
+            rate_bands = np.searchsorted(_FAILURE_RATE_THRESHOLDS, failure_rates, side="left")
+            streak_bands = np.searchsorted(_STREAK_THRESHOLDS, consecutive_failures, side="right")
+            rate_scores = np.array([risk[1] if risk else 0 for risk in _FAILURE_RATE_RISKS])
+            risk_scores = rate_scores[rate_bands] + np.array(_STREAK_SCORES)[streak_bands] + 10 * high_frequency
+
+            for row, i in enumerate(eligible):
+                risk_factors = []
+                failure_rate_risk = _FAILURE_RATE_RISKS[rate_bands[row]]
+                if failure_rate_risk:
+                    risk_factors.append(failure_rate_risk[0])
+                if streak_bands[row]:
+                    risk_factors.append(f"{consecutive_failures[row]} consecutive failures")
+                if high_frequency[row]:
+                    risk_factors.append("Very high build frequency")
+                predictions[i] = self._build_prediction(
+                    pipeline_names[i], int(risk_scores[row]), float(failure_rates[row]), risk_factors, int(counts[row])
+                )
+
+            await ctx_info(ctx, logger, "Prediction complete for %d of %d pipelines", len(eligible), len(pipeline_names))
+            return predictions
+
+        except Exception as e:
+            await ctx.error(f"Error predicting failures for {len(pipeline_names)} pipelines: {str(e)}")
+            raise
+
+    def _build_prediction(
+        self, pipeline_name: str, risk_score: int, failure_rate: float, risk_factors: list[str], builds_analyzed: int
+    ) -> dict[str, Any]:
+        """Turn a risk score into the prediction returned to the client."""
+        _, risk_level, recommendation = _RISK_BANDS[bisect_right(_RISK_THRESHOLDS, risk_score)]
+        return {
+            "pipeline_name": pipeline_name,
+            "risk_level": risk_level,
+            "risk_score": _clamp(risk_score),
+            "failure_probability": _clamp(int(failure_rate) + risk_score * 3 // 10),
+            "risk_factors": risk_factors,
+            "recommendation": recommendation,
+            "analysis_date": self._analysis_date(),
+            "builds_analyzed": builds_analyzed
+        }
+
     async def suggest_pipeline_optimization(self, pipeline_name: str, ctx: Context) -> list[dict[str, str]]:
         """AI suggestions for optimizing pipeline performance."""
-        await ctx.info(f"Generating optimization suggestions for pipeline: {pipeline_name}")
+        await ctx_info(ctx, logger, "Generating optimization suggestions for pipeline: %s", pipeline_name)
 
         if not self.jenkins.is_initialized():
             await ctx.error("Jenkins not initialized. Please configure Jenkins connection first.")
             raise ValueError("Jenkins not initialized. Please configure Jenkins connection first.")
 
         try:
-            await ctx.info("Analyzing pipeline performance...")
-            builds = self.jenkins.get_builds(pipeline_name, 30)
-            job_info = self.jenkins.get_job_info(pipeline_name)
+            await ctx_info(ctx, logger, "Analyzing pipeline performance...")
+            builds = await asyncio.to_thread(self._cached_get_builds, pipeline_name, 30)
+            if not builds:
+                await ctx_info(ctx, logger, "No builds available; returning default suggestion.")
+                return [dict(_GENERIC_SUGGESTION)]
+
+            job_info = await asyncio.to_thread(self._cached_get_job_info, pipeline_name) or {}
+            stats = self._analyze_builds(builds)
 
             suggestions = []
 
             # Analyze build duration
-            durations = [format_duration_seconds(b.get("duration", 0)) for b in builds if b.get("duration")]
-            if durations:
-                avg_duration = sum(durations) / len(durations)
-                max_duration = max(durations)
+            if stats.duration_count:
+                avg_duration = stats.avg_duration
+                max_duration = stats.max_duration
 
                 if max_duration > avg_duration * 2:
                     suggestions.append({
@@ -154,7 +350,7 @@ class AITools:
                     })
 
             # Analyze failure patterns
-            failure_rate = len([b for b in builds if b.get("result") == "FAILURE"]) / len(builds) * 100
+            failure_rate = stats.failures * 100.0 / stats.count
             if failure_rate > 20:
                 suggestions.append({
                     "category": "Reliability",
@@ -173,15 +369,14 @@ class AITools:
                 })
 
             # Check build frequency
-            if len(builds) > 1:
-                try:
-                    time_span = (self._parse_timestamp(builds[0].get("timestamp")) -
-                                self._parse_timestamp(builds[-1].get("timestamp"))).total_seconds() / 3600
-                except Exception:
+            if stats.count > 1:
+                time_span = stats.time_span_hours
+                if time_span is None:
                     time_span = 1  # Default to 1 hour if parsing fails
-                builds_per_hour = len(builds) / time_span if time_span > 0 else 0
 
-                if builds_per_hour > 1:
+                # More than 1 build/hour; the rate is only computed for the message
+                if time_span > 0 and stats.count > time_span:
+                    builds_per_hour = stats.count / time_span
                     suggestions.append({
                         "category": "Efficiency",
                         "priority": "Medium",
@@ -190,14 +385,9 @@ class AITools:
                     })
 
             # General suggestions
-            suggestions.append({
-                "category": "Best Practices",
-                "priority": "Low",
-                "suggestion": "Add pipeline health checks and monitoring",
-                "reason": "Proactive monitoring helps prevent issues"
-            })
-
-            await ctx.info(f"Generated {len(suggestions)} optimization suggestions")
+            suggestions.append(dict(_GENERIC_SUGGESTION))
+
+            await ctx_info(ctx, logger, "Generated %d optimization suggestions", len(suggestions))
             return suggestions
 
         except Exception as e:
@@ -1,15 +1,49 @@
 """Advanced Analytics & Reporting Tools for Jenkins Pipeline Intelligence."""
 
-import hashlib
+import asyncio
 import logging
 import re
 from datetime import datetime
+from operator import itemgetter
 from typing import Any
 
 from fastmcp import Context
 
+from utils.sanitizer import detect_sensitive_data, protect_identifying_names
+
 logger = logging.getLogger(__name__)
 
+# Report keys whose values this module fills from its own closed vocabulary, timestamps or
+# build results; they never carry user data. pipeline_name and period are not among them.
+_SAFE_KEYS = frozenset({
+    'generated_at', 'data_source', 'build_frequency', 'performance_trend', 'build_time_trend',
+    'type', 'title', 'x', 'x_label', 'y_label', 'status', 'error', 'message',
+})
+
+# Build attributes the reports read, fetched for all builds with one tree query
+_BUILD_FIELDS = ("number", "result", "duration", "timestamp")
+
+# Console log keywords behind each failure pattern label; only ERROR is case-sensitive
+_FAILURE_KEYWORDS = re.compile(r'(ERROR)|(?i:(timeout)|(permission))')
+_FAILURE_LABELS = ("Build errors detected", "Timeout issues", "Permission issues")
+
+# Containers walked by the report sanitizer; a tuple is cheaper for isinstance than dict | list
+_CONTAINER_TYPES = (dict, list)
+
+# The shortest string any pattern can match is a bare environment name such as "qa"
+_MIN_MATCH_LEN = 2
+
+
+def _summary_statistics(values: list[float]) -> dict[str, float]:
+    """Average, min, max and population variance of a non-empty series, rounded to 2 places."""
+    mean = sum(values) / len(values)
+    return {
+        "average": round(mean, 2),
+        "min": round(min(values), 2),
+        "max": round(max(values), 2),
+        "variance": round(sum((x - mean) ** 2 for x in values) / len(values), 2)
+    }
+
 
 class AnalyticsTools:
     """Advanced analytics and reporting tools for Jenkins pipelines."""
@@ -19,92 +53,38 @@ class AnalyticsTools:
 
     def _detect_sensitive_data(self, text: str) -> str:
         """Detect and hash sensitive data for AI communication while keeping real data locally."""
-        if not text:
-            return text
-
-        # Patterns for sensitive data
-        patterns = {
-            'password': r'(?i)(password|passwd|pwd)\s*[:=]\s*["\']?([^"\'\s]{3,})["\']?',
-            'token': r'(?i)(token|bearer|api[_-]?key)\s*[:=]\s*["\']?([a-zA-Z0-9._-]{10,})["\']?',
-            'secret': r'(?i)(secret|key)\s*[:=]\s*["\']?([a-zA-Z0-9._-]{10,})["\']?',
-            'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            'ip': r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b',
-            'url': r'https?://[^\s<>"{}|\\^`\[\]]+',
-            'pipeline_name': r'\b(?:pipeline|job|build)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'cluster_name': r'\b(?:cluster|eks|gke|aks)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'environment': r'\b(?:env|environment)\s*[:=]\s*["\']?(prod|production|staging|stage|dev|development|test|qa|uat)["\']?',
-            'project_name': r'\b(?:project|repo|repository)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'namespace': r'\b(?:namespace|ns)\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'service_name': r'\b(?:service|svc)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'user_name': r'\b(?:user|username)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'team_name': r'\b(?:team|group)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'company_name': r'\b(?:company|org|organization)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-        }
-
-        protected_text = text
-        for pattern_name, pattern in patterns.items():
-            matches = re.finditer(pattern, protected_text)
-            for match in matches:
-                if match.group(2) if len(match.groups()) > 1 else match.group(0):
-                    sensitive_value = match.group(2) if len(match.groups()) > 1 else match.group(0)
-                    # Create a hash for AI communication
-                    hash_value = hashlib.sha256(sensitive_value.encode()).hexdigest()[:8]
-                    protected_text = protected_text.replace(sensitive_value, f"[{pattern_name.upper()}_HASH_{hash_value}]")
-
-        # Also protect identifying names
-        protected_text = self._protect_identifying_names(protected_text)
-
-        return protected_text
+        return detect_sensitive_data(text)
 
     def _protect_identifying_names(self, text: str) -> str:
         """Protect identifying names like pipeline names, cluster names, etc."""
-        if not text:
-            return text
-
-        # Common naming patterns that might contain sensitive information
-        name_patterns = {
-            'pipeline_name': r'\b(?:eks|gke|aks|k8s|kube)[-_]?[a-zA-Z0-9]{2,}\b',  # eks-prod, gke-staging, etc.
-            'cluster_name': r'\b(?:cluster|eks|gke|aks)[-_]?[a-zA-Z0-9]{2,}\b',  # cluster-prod, eks-dev, etc.
-            'environment_name': r'\b(?:prod|production|staging|stage|dev|development|test|qa|uat)[-_]?[a-zA-Z0-9]{0,}\b',
-            'project_name': r'\b(?:project|repo|app)[-_]?[a-zA-Z0-9]{2,}\b',  # project-abc, repo-xyz, etc.
-            'service_name': r'\b(?:svc|service)[-_]?[a-zA-Z0-9]{2,}\b',  # svc-api, service-web, etc.
-            'team_name': r'\b(?:team|group)[-_]?[a-zA-Z0-9]{2,}\b',  # team-devops, group-backend, etc.
-            'company_name': r'\b(?:company|org|corp)[-_]?[a-zA-Z0-9]{2,}\b',  # company-abc, org-xyz, etc.
-            'folder_name': r'\b(?:folder|dir|directory)[-_]?[a-zA-Z0-9]{2,}\b',  # folder-abc, dir-xyz, etc.
-            'app_name': r'\b(?:app|application)[-_]?[a-zA-Z0-9]{2,}\b',  # app-web, application-api, etc.
-            'branch_name': r'\b(?:branch|br)[-_]?[a-zA-Z0-9]{2,}\b',  # branch-feature, br-main, etc.
-            'org_name': r'\b(?:org|organization)[-_]?[a-zA-Z0-9]{2,}\b',  # org-company, organization-abc, etc.
-            'repo_name': r'\b(?:repo|repository)[-_]?[a-zA-Z0-9]{2,}\b',  # repo-backend, repository-frontend, etc.
-            'file_name': r'\b(?:file|src|lib)[-_]?[a-zA-Z0-9]{2,}\.(?:py|js|ts|java|go|rs|cpp|c|h|hpp|cs|php|rb|swift|kt|scala|sh|bash|ps1|yaml|yml|json|xml|html|css|sql|md|txt)\b',  # file-utils.py, src-main.js, etc.
-        }
-
-        protected_text = text
-        for pattern_name, pattern in name_patterns.items():
-            matches = re.finditer(pattern, protected_text)
-            for match in matches:
-                name_value = match.group(0)
-                # Create a hash for AI communication
-                hash_value = hashlib.sha256(name_value.encode()).hexdigest()[:8]
-                protected_text = protected_text.replace(name_value, f"[{pattern_name.upper()}_HASH_{hash_value}]")
-
-        return protected_text
+        return protect_identifying_names(text)
 
     def _protect_sensitive_data_in_dict(self, data: dict[str, Any]) -> dict[str, Any]:
-        """Recursively protect sensitive data in dictionaries and lists."""
-        if isinstance(data, dict):
-            protected = {}
-            for key, value in data.items():
-                if isinstance(value, str):
-                    protected[key] = self._detect_sensitive_data(value)
-                elif isinstance(value, dict | list):
-                    protected[key] = self._protect_sensitive_data_in_dict(value)
-                else:
-                    protected[key] = value
-            return protected
-        elif isinstance(data, list):
-            return [self._protect_sensitive_data_in_dict(item) for item in data]
-        else:
-            return data
+        """Protect sensitive data in nested dictionaries and lists, in place.
+
+        Only applied to reports this module has just built, so nothing else holds the unprotected tree.
+        """
+        # The same pipeline names and URLs recur across a report; scan each distinct string once
+        memo: dict[str, str] = {}
+        stack = [data] if isinstance(data, _CONTAINER_TYPES) else []
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if key in _SAFE_KEYS:
+                        continue
+                    if type(value) is str:
+                        if len(value) >= _MIN_MATCH_LEN and not value.isdigit():
+                            protected_value = memo.get(value)
+                            if protected_value is None:
+                                protected_value = memo[value] = self._detect_sensitive_data(value)
+                            node[key] = protected_value
+                    elif isinstance(value, _CONTAINER_TYPES):
+                        stack.append(value)
+            else:
+                # Strings held directly in lists are left as they are
+                stack.extend(item for item in node if isinstance(item, _CONTAINER_TYPES))
+        return data
 
     def _generate_chart_data(self, builds: list[dict], chart_type: str = "build_timeline") -> dict[str, Any]:
         """Generate chart data for visualization."""
@@ -113,20 +93,26 @@ class AnalyticsTools:
 
         if chart_type == "build_timeline":
             # Timeline chart data
+            # Order by the raw epoch timestamp before formatting, rather than sorting the ISO strings
+            timed_builds = sorted(
+                (build for build in builds if build.get('timestamp') and build.get('result')),
+                key=itemgetter('timestamp')
+            )
+            fromtimestamp = datetime.fromtimestamp
             timeline_data = []
-            for build in builds:
-                if build.get('timestamp') and build.get('result'):
-                    timeline_data.append({
-                        "x": datetime.fromtimestamp(build['timestamp'] / 1000).isoformat(),
-                        "y": build['duration'] / 1000 if build.get('duration') else 0,
-                        "status": build['result'],
-                        "build_number": build['number']
-                    })
+            for build in timed_builds:
+                duration = build.get('duration')
+                timeline_data.append({
+                    "x": fromtimestamp(build['timestamp'] / 1000).isoformat(),
+                    "y": duration / 1000 if duration else 0,
+                    "status": build['result'],
+                    "build_number": build['number']
+                })
 
             return {
                 "type": "line",
                 "title": "Build Duration Timeline",
-                "data": sorted(timeline_data, key=lambda x: x['x']),
+                "data": timeline_data,
                 "x_label": "Time",
                 "y_label": "Duration (seconds)"
             }
@@ -135,10 +121,10 @@ class AnalyticsTools:
             # Success rate over time
             success_data = []
             window_size = 5  # 5 builds per window
-            for i in range(0, len(builds), window_size):
-                window_builds = builds[i:i + window_size]
-                success_count = sum(1 for b in window_builds if b.get('result') == 'SUCCESS')
-                success_rate = (success_count / len(window_builds)) * 100
+            succeeded = [build.get('result') == 'SUCCESS' for build in builds]
+            for i in range(0, len(succeeded), window_size):
+                window = succeeded[i:i + window_size]
+                success_rate = (sum(window) / len(window)) * 100
                 success_data.append({
                     "x": f"Builds {i+1}-{min(i+window_size, len(builds))}",
                     "y": success_rate
@@ -168,9 +154,9 @@ class AnalyticsTools:
             # Determine number of builds to analyze based on period
             build_limit = 50 if period == "last_30d" else 20 if period == "last_7d" else 10
 
-            # Get pipeline builds from Jenkins
+            # Get pipeline builds from Jenkins, with every field the report needs, in one request
             await ctx.info(f"Fetching last {build_limit} builds from Jenkins...")
-            builds = self.jenkins.get_builds(pipeline_name, build_limit)
+            builds = await asyncio.to_thread(self.jenkins.get_builds, pipeline_name, build_limit, _BUILD_FIELDS)
 
             if not builds:
                 return {
@@ -179,53 +165,54 @@ class AnalyticsTools:
                     "message": "Pipeline has no builds or Jenkins connection failed"
                 }
 
-            # Get detailed build information for each build
-            detailed_builds = []
+            # Calculate real metrics from build history in a single pass, keeping the
+            # results and durations as flat lists for the recommendations below
+            successful_builds = failed_builds = aborted_builds = 0
+            results = []
+            build_times = []
+            failed_numbers = []
             for build in builds:
-                try:
-                    build_info = self.jenkins.get_build_info(pipeline_name, build['number'])
-                    detailed_builds.append(build_info)
-                except Exception as e:
-                    await ctx.warning(f"Could not get details for build {build['number']}: {str(e)}")
-                    detailed_builds.append(build)
-
-            # Calculate real metrics from build history
-            total_builds = len(detailed_builds)
-            successful_builds = sum(1 for build in detailed_builds if build.get('result') == 'SUCCESS')
-            failed_builds = sum(1 for build in detailed_builds if build.get('result') == 'FAILURE')
-            aborted_builds = sum(1 for build in detailed_builds if build.get('result') == 'ABORTED')
+                result = build.get('result')
+                results.append(result)
+                if result == 'SUCCESS':
+                    successful_builds += 1
+                elif result == 'FAILURE':
+                    failed_builds += 1
+                    failed_numbers.append(build['number'])
+                elif result == 'ABORTED':
+                    aborted_builds += 1
+                duration = build.get('duration')
+                if duration and duration > 0:
+                    build_times.append(duration)
+
+            total_builds = len(builds)
             success_rate = (successful_builds / total_builds * 100) if total_builds > 0 else 0
 
-            # Calculate build times from actual data
-            build_times = []
-            for build in detailed_builds:
-                if build.get('duration') and build.get('duration') > 0:
-                    build_times.append(build['duration'])
-
             avg_build_time = sum(build_times) / len(build_times) if build_times else 0
             min_build_time = min(build_times) if build_times else 0
             max_build_time = max(build_times) if build_times else 0
 
-            # Analyze failure patterns from build logs
-            failure_patterns = []
-            for build in detailed_builds:
-                if build.get('result') == 'FAILURE':
-                    try:
-                        # Get build console output
-                        console_output = self.jenkins.get_build_console_output(pipeline_name, build['number'])
-                        # Look for common failure patterns
-                        if "ERROR" in console_output:
-                            failure_patterns.append("Build errors detected")
-                        if "timeout" in console_output.lower():
-                            failure_patterns.append("Timeout issues")
-                        if "permission" in console_output.lower():
-                            failure_patterns.append("Permission issues")
-                    except Exception:
-                        failure_patterns.append("Unknown failure")
+            # Analyze failure patterns from build logs, fetched concurrently
+            console_outputs = await asyncio.gather(
+                *(asyncio.to_thread(self.jenkins.get_build_console_output, pipeline_name, number) for number in failed_numbers),
+                return_exceptions=True
+            )
+            failure_patterns: set[str] = set()
+            for console_output in console_outputs:
+                if isinstance(console_output, Exception):
+                    failure_patterns.add("Unknown failure")
+                    continue
+                # Look for common failure patterns in a single scan, stopping once all are found
+                found = set()
+                for match in _FAILURE_KEYWORDS.finditer(console_output):
+                    found.add(match.lastindex)
+                    if len(found) == len(_FAILURE_LABELS):
+                        break
+                failure_patterns.update(_FAILURE_LABELS[group - 1] for group in found)
 
             # Generate chart data
-            timeline_chart = self._generate_chart_data(detailed_builds, "build_timeline")
-            success_chart = self._generate_chart_data(detailed_builds, "success_rate")
+            timeline_chart = self._generate_chart_data(builds, "build_timeline")
+            success_chart = self._generate_chart_data(builds, "success_rate")
 
             # Create comprehensive report
             report_data = {
@@ -245,7 +232,7 @@ class AnalyticsTools:
                 },
                 "analysis": {
                     "build_frequency": f"Analyzed {total_builds} builds",
-                    "failure_patterns": list(set(failure_patterns)),
+                    "failure_patterns": list(failure_patterns),
                     "performance_trend": "stable" if success_rate > 80 else "needs_attention",
                     "build_time_trend": "stable" if avg_build_time < 300000 else "slow"
                 },
@@ -253,7 +240,7 @@ class AnalyticsTools:
                     "timeline": timeline_chart,
                     "success_rate": success_chart
                 },
-                "recommendations": self._generate_recommendations(detailed_builds, success_rate, avg_build_time)
+                "recommendations": self._generate_recommendations(results, build_times, success_rate, avg_build_time)
             }
 
             await ctx.info(f"✅ Report generated successfully - {total_builds} builds analyzed")
@@ -266,7 +253,22 @@ class AnalyticsTools:
             await ctx.error(f"Error generating report: {str(e)}")
             raise
 
-    def _generate_recommendations(self, builds: list[dict], success_rate: float, avg_build_time: float) -> list[str]:
+    async def _get_pipeline_builds(self, pipeline_name: str, build_limit: int, ctx: Context) -> list[dict]:
+        """Fetch a pipeline's recent builds with the fields the comparison needs; empty when it has none."""
+        await ctx.info(f"Analyzing {pipeline_name}...")
+        builds = await asyncio.to_thread(self.jenkins.get_builds, pipeline_name, build_limit, _BUILD_FIELDS)
+
+        if not builds:
+            await ctx.warning(f"No builds found for {pipeline_name}")
+        return builds
+
+    def _generate_recommendations(
+        self,
+        results: list[str | None],
+        build_times: list[int],
+        success_rate: float,
+        avg_build_time: float
+    ) -> list[str]:
         """Generate recommendations based on real build data analysis."""
         recommendations = []
 
@@ -280,12 +282,11 @@ class AnalyticsTools:
             recommendations.append("Moderate build times - review build steps for optimization opportunities")
 
         # Check for frequent failures
-        recent_failures = sum(1 for build in builds[-10:] if build.get('result') == 'FAILURE')
+        recent_failures = results[-10:].count('FAILURE')
         if recent_failures > 3:
             recommendations.append("Recent build failures detected - review recent changes and error logs")
 
         # Check for build time variance
-        build_times = [b.get('duration', 0) for b in builds if b.get('duration')]
         if build_times:
             variance = max(build_times) - min(build_times)
             if variance > 300000:  # 5 minutes variance
@@ -323,32 +324,35 @@ class AnalyticsTools:
 
             pipeline_metrics = []
 
-            for pipeline_name in pipeline_names:
-                await ctx.info(f"Analyzing {pipeline_name}...")
-                builds = self.jenkins.get_builds(pipeline_name, build_limit)
+            # Fetch every pipeline's build history concurrently
+            pipeline_builds = await asyncio.gather(
+                *(self._get_pipeline_builds(pipeline_name, build_limit, ctx) for pipeline_name in pipeline_names)
+            )
 
+            for pipeline_name, builds in zip(pipeline_names, pipeline_builds, strict=True):
                 if not builds:
-                    await ctx.warning(f"No builds found for {pipeline_name}")
                     continue
 
-                # Get detailed build information
-                detailed_builds = []
+                # Calculate real metrics from build history in a single pass
+                successful_builds = failed_builds = 0
+                build_times = []
+                timestamps = []
                 for build in builds:
-                    try:
-                        build_info = self.jenkins.get_build_info(pipeline_name, build['number'])
-                        detailed_builds.append(build_info)
-                    except Exception as e:
-                        await ctx.warning(f"Could not get details for {pipeline_name} build {build['number']}: {str(e)}")
-                        detailed_builds.append(build)
-
-                # Calculate real metrics from build history
-                total_builds = len(detailed_builds)
-                successful_builds = sum(1 for build in detailed_builds if build.get('result') == 'SUCCESS')
-                failed_builds = sum(1 for build in detailed_builds if build.get('result') == 'FAILURE')
+                    result = build.get('result')
+                    if result == 'SUCCESS':
+                        successful_builds += 1
+                    elif result == 'FAILURE':
+                        failed_builds += 1
+                    duration = build.get('duration')
+                    if duration and duration > 0:
+                        build_times.append(duration)
+                    timestamp = build.get('timestamp')
+                    if timestamp:
+                        timestamps.append(timestamp)
+
+                total_builds = len(builds)
                 success_rate = (successful_builds / total_builds * 100) if total_builds > 0 else 0
 
-                # Calculate build times from actual data
-                build_times = [build.get('duration', 0) for build in detailed_builds if build.get('duration') and build.get('duration') > 0]
                 avg_build_time = sum(build_times) / len(build_times) if build_times else 0
                 min_build_time = min(build_times) if build_times else 0
                 max_build_time = max(build_times) if build_times else 0
@@ -357,9 +361,9 @@ class AnalyticsTools:
                 efficiency_score = success_rate * (1 / (avg_build_time / 1000 + 1)) if avg_build_time > 0 else 0
 
                 # Calculate build frequency (builds per day)
-                if detailed_builds:
-                    first_build_time = min(build.get('timestamp', 0) for build in detailed_builds if build.get('timestamp'))
-                    last_build_time = max(build.get('timestamp', 0) for build in detailed_builds if build.get('timestamp'))
+                if builds:
+                    first_build_time = min(timestamps)
+                    last_build_time = max(timestamps)
                     time_span_days = (last_build_time - first_build_time) / (1000 * 60 * 60 * 24) if last_build_time > first_build_time else 1
                     builds_per_day = total_builds / time_span_days if time_span_days > 0 else total_builds
                 else:
@@ -400,23 +404,9 @@ class AnalyticsTools:
                 efficiency_scores = [p["efficiency_score"] for p in pipeline_metrics]
 
                 comparison_data["statistical_analysis"] = {
-                    "success_rate": {
-                        "average": round(sum(success_rates) / len(success_rates), 2),
-                        "min": round(min(success_rates), 2),
-                        "max": round(max(success_rates), 2),
-                        "variance": round(sum((x - sum(success_rates)/len(success_rates))**2 for x in success_rates) / len(success_rates), 2)
-                    },
-                    "build_time": {
-                        "average": round(sum(build_times) / len(build_times), 2),
-                        "min": round(min(build_times), 2),
-                        "max": round(max(build_times), 2),
-                        "variance": round(sum((x - sum(build_times)/len(build_times))**2 for x in build_times) / len(build_times), 2)
-                    },
-                    "efficiency": {
-                        "average": round(sum(efficiency_scores) / len(efficiency_scores), 2),
-                        "min": round(min(efficiency_scores), 2),
-                        "max": round(max(efficiency_scores), 2)
-                    }
+                    "success_rate": _summary_statistics(success_rates),
+                    "build_time": _summary_statistics(build_times),
+                    "efficiency": _summary_statistics(efficiency_scores)
                 }
 
             await ctx.info(f"✅ Performance comparison completed - {len(pipeline_metrics)} pipelines analyzed")
@@ -1,7 +1,6 @@
 """Core pipeline management tools."""
 
-import hashlib
-import re
+import asyncio
 from datetime import datetime
 from typing import Any
 
@@ -21,6 +20,13 @@ from utils import (
     generate_suggested_fixes,
     parse_timestamp,
 )
+from utils.sanitizer import detect_sensitive_data, protect_identifying_names
+
+# Upper bound on pipelines fetched from Jenkins at once
+_MAX_CONCURRENT_PIPELINES = 8
+
+# Job classes listed as pipelines
+_PIPELINE_JOB_CLASSES = frozenset({"hudson.model.FreeStyleProject", "org.jenkinsci.plugins.workflow.job.WorkflowJob"})
 
 
 class CoreTools:
@@ -31,93 +37,64 @@ class CoreTools:
 
     def _detect_sensitive_data(self, text: str) -> str:
         """Detect and hash sensitive data for AI communication while keeping real data locally."""
-        if not text:
-            return text
-
-        # Patterns for sensitive data
-        patterns = {
-            'password': r'(?i)(password|passwd|pwd)\s*[:=]\s*["\']?([^"\'\s]{3,})["\']?',
-            'token': r'(?i)(token|bearer|api[_-]?key)\s*[:=]\s*["\']?([a-zA-Z0-9._-]{10,})["\']?',
-            'secret': r'(?i)(secret|key)\s*[:=]\s*["\']?([a-zA-Z0-9._-]{10,})["\']?',
-            'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            'ip': r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b',
-            'url': r'https?://[^\s<>"{}|\\^`\[\]]+',
-            'pipeline_name': r'\b(?:pipeline|job|build)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'cluster_name': r'\b(?:cluster|eks|gke|aks)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'environment': r'\b(?:env|environment)\s*[:=]\s*["\']?(prod|production|staging|stage|dev|development|test|qa|uat)["\']?',
-            'project_name': r'\b(?:project|repo|repository)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'namespace': r'\b(?:namespace|ns)\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'service_name': r'\b(?:service|svc)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'user_name': r'\b(?:user|username)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'team_name': r'\b(?:team|group)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-            'company_name': r'\b(?:company|org|organization)[_-]?name\s*[:=]\s*["\']?([a-zA-Z0-9._-]{3,})["\']?',
-        }
-
-        protected_text = text
-        for pattern_name, pattern in patterns.items():
-            matches = re.finditer(pattern, protected_text)
-            for match in matches:
-                if match.group(2) if len(match.groups()) > 1 else match.group(0):
-                    sensitive_value = match.group(2) if len(match.groups()) > 1 else match.group(0)
-                    # Create a hash for AI communication
-                    hash_value = hashlib.sha256(sensitive_value.encode()).hexdigest()[:8]
-                    protected_text = protected_text.replace(sensitive_value, f"[{pattern_name.upper()}_HASH_{hash_value}]")
-
-        # Also protect identifying names
-        protected_text = self._protect_identifying_names(protected_text)
-
-        return protected_text
+        return detect_sensitive_data(text)
 
     def _protect_identifying_names(self, text: str) -> str:
         """Protect identifying names like pipeline names, cluster names, etc."""
-        if not text:
-            return text
-
-        # Common naming patterns that might contain sensitive information
-        name_patterns = {
-            'pipeline_name': r'\b(?:eks|gke|aks|k8s|kube)[-_]?[a-zA-Z0-9]{2,}\b',  # eks-prod, gke-staging, etc.
-            'cluster_name': r'\b(?:cluster|eks|gke|aks)[-_]?[a-zA-Z0-9]{2,}\b',  # cluster-prod, eks-dev, etc.
-            'environment_name': r'\b(?:prod|production|staging|stage|dev|development|test|qa|uat)[-_]?[a-zA-Z0-9]{0,}\b',
-            'project_name': r'\b(?:project|repo|app)[-_]?[a-zA-Z0-9]{2,}\b',  # project-abc, repo-xyz, etc.
-            'service_name': r'\b(?:svc|service)[-_]?[a-zA-Z0-9]{2,}\b',  # svc-api, service-web, etc.
-            'team_name': r'\b(?:team|group)[-_]?[a-zA-Z0-9]{2,}\b',  # team-devops, group-backend, etc.
-            'company_name': r'\b(?:company|org|corp)[-_]?[a-zA-Z0-9]{2,}\b',  # company-abc, org-xyz, etc.
-            'folder_name': r'\b(?:folder|dir|directory)[-_]?[a-zA-Z0-9]{2,}\b',  # folder-abc, dir-xyz, etc.
-            'app_name': r'\b(?:app|application)[-_]?[a-zA-Z0-9]{2,}\b',  # app-web, application-api, etc.
-            'branch_name': r'\b(?:branch|br)[-_]?[a-zA-Z0-9]{2,}\b',  # branch-feature, br-main, etc.
-            'org_name': r'\b(?:org|organization)[-_]?[a-zA-Z0-9]{2,}\b',  # org-company, organization-abc, etc.
-            'repo_name': r'\b(?:repo|repository)[-_]?[a-zA-Z0-9]{2,}\b',  # repo-backend, repository-frontend, etc.
-            'file_name': r'\b(?:file|src|lib)[-_]?[a-zA-Z0-9]{2,}\.(?:py|js|ts|java|go|rs|cpp|c|h|hpp|cs|php|rb|swift|kt|scala|sh|bash|ps1|yaml|yml|json|xml|html|css|sql|md|txt)\b',  # file-utils.py, src-main.js, etc.
-        }
-
-        protected_text = text
-        for pattern_name, pattern in name_patterns.items():
-            matches = re.finditer(pattern, protected_text)
-            for match in matches:
-                name_value = match.group(0)
-                # Create a hash for AI communication
-                hash_value = hashlib.sha256(name_value.encode()).hexdigest()[:8]
-                protected_text = protected_text.replace(name_value, f"[{pattern_name.upper()}_HASH_{hash_value}]")
-
-        return protected_text
+        return protect_identifying_names(text)
 
     def _protect_sensitive_data_in_dict(self, data: dict[str, Any]) -> dict[str, Any]:
-        """Recursively protect sensitive data in dictionaries and lists."""
-        if isinstance(data, dict):
-            protected = {}
-            for key, value in data.items():
-                if isinstance(value, str):
-                    protected[key] = self._detect_sensitive_data(value)
-                elif isinstance(value, dict | list):
-                    protected[key] = self._protect_sensitive_data_in_dict(value)
-                else:
-                    protected[key] = value
-            return protected
-        elif isinstance(data, list):
-            return [self._protect_sensitive_data_in_dict(item) for item in data]
-        else:
+        """Return a copy of nested dictionaries and lists with sensitive data protected.
+
+        Walks the tree with an explicit stack of (source, copy) pairs, so deeply nested
+        payloads cost no Python frames and the input is left untouched. A payload with
+        nothing to protect is returned as it is, without copying.
+        """
+        if not isinstance(data, dict | list):
+            return data
+
+        # Scan each distinct string value once; the copy below reuses the results
+        protected_values: dict[str, str] = {}
+        changed = False
+        pending = [data]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, dict):
+                for value in node.values():
+                    if isinstance(value, str):
+                        if value not in protected_values:
+                            protected_values[value] = protected_value = self._detect_sensitive_data(value)
+                            changed = changed or protected_value != value
+                    elif isinstance(value, dict | list):
+                        pending.append(value)
+            else:
+                pending.extend(item for item in node if isinstance(item, dict | list))
+        if not changed:
             return data
 
+        protected = {} if isinstance(data, dict) else []
+        stack = [(data, protected)]
+        while stack:
+            source, target = stack.pop()
+            if isinstance(source, dict):
+                for key, value in source.items():
+                    if isinstance(value, str):
+                        target[key] = protected_values[value]
+                    elif isinstance(value, dict | list):
+                        target[key] = child = {} if isinstance(value, dict) else []
+                        stack.append((value, child))
+                    else:
+                        target[key] = value
+            else:
+                # Strings held directly in lists are left as they are
+                for item in source:
+                    if isinstance(item, dict | list):
+                        child = {} if isinstance(item, dict) else []
+                        stack.append((item, child))
+                        item = child
+                    target.append(item)
+        return protected
+
     def _protect_pydantic_model(self, model) -> dict[str, Any]:
         """Convert Pydantic model to dict and protect sensitive data."""
         if hasattr(model, 'model_dump'):
@@ -144,23 +121,25 @@ class CoreTools:
             await ctx.info("Fetching jobs from Jenkins...")
             jobs = self.jenkins.get_jobs()
             pipelines = []
+            needle = search.lower()
 
             for i, job in enumerate(jobs):
-                if job.get("_class") in ["hudson.model.FreeStyleProject", "org.jenkinsci.plugins.workflow.job.WorkflowJob"]:
+                if job.get("_class") in _PIPELINE_JOB_CLASSES:
                     name = job["name"]
 
-                    if search and search.lower() not in name.lower() and search.lower() not in job.get("description", "").lower():
+                    if needle and needle not in name.lower() and needle not in job.get("description", "").lower():
                         continue
 
+                    last_build = job.get("lastBuild", {})
                     pipeline = PipelineInfo(
                         name=name,
                         display_name=job.get("displayName", name),
                         url=job["url"],
                         description=job.get("description", ""),
                         is_enabled=not job.get("disabled", False),
-                        last_build_number=job.get("lastBuild", {}).get("number"),
-                        last_build_status=job.get("lastBuild", {}).get("result"),
-                        last_build_time=parse_timestamp(job.get("lastBuild", {}).get("timestamp")),
+                        last_build_number=last_build.get("number"),
+                        last_build_status=last_build.get("result"),
+                        last_build_time=parse_timestamp(last_build.get("timestamp")),
                         health_score=job.get("healthReport", [{}])[0].get("score") if job.get("healthReport") else None,
                     )
                     pipelines.append(pipeline)
@@ -186,17 +165,18 @@ class CoreTools:
 
         try:
             await ctx.info("Fetching pipeline details from Jenkins...")
-            job_info = self.jenkins.get_job_info(pipeline_name)
+            job_info = await asyncio.to_thread(self.jenkins.get_job_info, pipeline_name)
 
+            last_build = job_info.get("lastBuild", {})
             pipeline = PipelineInfo(
                 name=job_info["name"],
                 display_name=job_info.get("displayName", job_info["name"]),
                 url=job_info["url"],
                 description=job_info.get("description", ""),
                 is_enabled=not job_info.get("disabled", False),
-                last_build_number=job_info.get("lastBuild", {}).get("number"),
-                last_build_status=job_info.get("lastBuild", {}).get("result"),
-                last_build_time=parse_timestamp(job_info.get("lastBuild", {}).get("timestamp")),
+                last_build_number=last_build.get("number"),
+                last_build_status=last_build.get("result"),
+                last_build_time=parse_timestamp(last_build.get("timestamp")),
                 health_score=job_info.get("healthReport", [{}])[0].get("score") if job_info.get("healthReport") else None,
             )
 
@@ -217,24 +197,28 @@ class CoreTools:
 
         try:
             await ctx.info("Fetching build data from Jenkins...")
-            builds_data = self.jenkins.get_builds(pipeline_name, limit)
+            builds_data = await asyncio.to_thread(self.jenkins.get_builds, pipeline_name, limit)
             builds = []
             skipped_builds = 0
 
-            for i, build_data in enumerate(builds_data):
+            # Get detailed build information for every numbered build concurrently
+            build_numbers = [build_data.get("number") for build_data in builds_data]
+            await ctx.info(f"Fetching details for {sum(1 for number in build_numbers if number)} builds...")
+            build_details = iter(await asyncio.gather(
+                *(asyncio.to_thread(self.jenkins.get_build_info, pipeline_name, number) for number in build_numbers if number),
+                return_exceptions=True
+            ))
+
+            for i, (build_data, build_number) in enumerate(zip(builds_data, build_numbers)):
                 try:
-                    build_number = build_data.get("number")
                     if not build_number:
                         await ctx.warning(f"Skipping build with missing number: {build_data}")
                         skipped_builds += 1
                         continue
 
-                    # Get detailed build information
-                    await ctx.info(f"Fetching details for build #{build_number}...")
-                    try:
-                        detailed_build = self.jenkins.get_build_info(pipeline_name, build_number)
-                    except Exception as detail_error:
-                        await ctx.warning(f"Could not get details for build #{build_number}: {str(detail_error)}")
+                    detailed_build = next(build_details)
+                    if isinstance(detailed_build, Exception):
+                        await ctx.warning(f"Could not get details for build #{build_number}: {str(detailed_build)}")
                         # Fall back to basic build data
                         detailed_build = build_data
 
@@ -308,7 +292,7 @@ class CoreTools:
             builds_data = self.jenkins.get_builds(pipeline_name, 100)
 
             # Filter builds by date
-            recent_builds = [b for b in builds_data if parse_timestamp(b.get("timestamp")) and parse_timestamp(b.get("timestamp")) >= cutoff_date]
+            recent_builds = [b for b in builds_data if (ts := parse_timestamp(b.get("timestamp"))) and ts >= cutoff_date]
 
             if not recent_builds:
                 await ctx.warning(f"No builds found in the {period} period")
@@ -323,17 +307,27 @@ class CoreTools:
                     trend="no_data"
                 )
 
-            # Calculate metrics
+            # Calculate metrics and duration totals in one pass
             total_builds = len(recent_builds)
-            successful_builds = len([b for b in recent_builds if b.get("result") == "SUCCESS"])
-            failed_builds = len([b for b in recent_builds if b.get("result") == "FAILURE"])
+            successful_builds = failed_builds = 0
+            duration_total = 0
+            duration_count = 0
+            for build in recent_builds:
+                result = build.get("result")
+                if result == "SUCCESS":
+                    successful_builds += 1
+                elif result == "FAILURE":
+                    failed_builds += 1
+                duration = build.get("duration")
+                if duration:
+                    duration_total += format_duration_seconds(duration)
+                    duration_count += 1
 
             success_rate = (successful_builds / total_builds) * 100
             failure_rate = (failed_builds / total_builds) * 100
 
             # Calculate average duration
-            durations = [format_duration_seconds(b.get("duration", 0)) for b in recent_builds if b.get("duration")]
-            avg_duration = sum(durations) / len(durations) if durations else 0
+            avg_duration = duration_total / duration_count if duration_count else 0
 
             # Determine trend
             trend = determine_trend(recent_builds)
@@ -412,14 +406,19 @@ class CoreTools:
         try:
             if pipeline_names:
                 await ctx.info(f"Analyzing specific pipelines: {pipeline_names}")
+                slots = asyncio.Semaphore(_MAX_CONCURRENT_PIPELINES)
+
+                async def fetch_details(name: str) -> PipelineInfo:
+                    async with slots:
+                        return await self.get_pipeline_details(name, ctx)
+
+                results = await asyncio.gather(*(fetch_details(name) for name in pipeline_names), return_exceptions=True)
                 pipelines = []
-                for name in pipeline_names:
-                    try:
-                        pipeline = await self.get_pipeline_details(name, ctx)
-                        pipelines.append(pipeline)
-                    except Exception:
+                for name, pipeline in zip(pipeline_names, results):
+                    if isinstance(pipeline, Exception):
                         await ctx.warning(f"Could not get details for pipeline: {name}")
                         continue
+                    pipelines.append(pipeline)
             else:
                 await ctx.info("Analyzing recent pipelines...")
                 pipelines = await self.list_pipelines(ctx, limit=10)
@@ -1,19 +1,63 @@
 """Jenkinsfile reconstruction and analysis service."""
 
+import asyncio
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any, Dict, List, Optional
+import io
 import re
+import xml.etree.ElementTree as ET
 
 from fastmcp import Context
 
 from services.jenkins_service import JenkinsService
 
+# Workflow API descriptions kept per (pipeline, analyzed build number); a build's
+# execution flow never changes once it has succeeded, unlike the pipeline config
+_EXECUTION_CACHE_MAX_SIZE = 128
+
+# Parsed config.xml kept per pipeline as (conditional request headers, XML, parsed
+# config); reused when Jenkins answers 304 or sends back the same document
+_CONFIG_CACHE_MAX_SIZE = 64
+
+# Build attributes needed to pick the build to analyze, fetched with one tree query
+_BUILD_FIELDS = ("number", "result")
+
+# Stage-name keywords -> echo message of the placeholder steps, checked in order
+_STAGE_STEP_MESSAGES = (
+    (("init", "setup"), "Initializing build environment"),
+    (("build", "compile"), "Building application"),
+    (("test",), "Running tests"),
+    (("deploy",), "Deploying application"),
+)
+
+# Stage-name keywords -> when condition, checked in order
+_WHEN_CONDITIONS = (
+    ("branch", "branch 'main'"),
+    ("environment", "environment name: 'DEPLOY_TO', value: 'production'"),
+    ("not", "not { branch 'develop' }"),
+)
+
+# Structure analysis flags and the technology each one reports, in report order
+_TECHNOLOGY_FLAGS = (
+    ("aws_integration", "AWS"),
+    ("kubernetes_integration", "Kubernetes"),
+    ("docker_usage", "Docker"),
+    ("helm_usage", "Helm"),
+    ("jenkins_library_usage", "Jenkins Shared Libraries"),
+)
+
+# env.NAME = value assignments spelled out in stage names
+_ENV_ASSIGNMENT_RE = re.compile(r'env\.(\w+)\s*=\s*([^\s]+)')
+
 
 class ExecutionAnalysisService:
     """Service for reconstructing and analyzing Jenkinsfile content from Jenkins execution data."""
 
     def __init__(self, jenkins_service: JenkinsService):
         self.jenkins = jenkins_service
+        self._execution_cache: OrderedDict[tuple[str, int], dict[str, Any]] = OrderedDict()
+        self._config_cache: OrderedDict[str, tuple[dict[str, str], str, dict[str, Any]]] = OrderedDict()
 
     async def reconstruct_jenkinsfile(self, pipeline_name: str, ctx: Context) -> dict[str, Any]:
         """Reconstruct Jenkinsfile content from pipeline execution data."""
@@ -24,42 +68,29 @@ class ExecutionAnalysisService:
             raise ValueError("Jenkins not initialized. Please configure Jenkins connection first.")
 
         try:
-            # Get recent builds for analysis
-            builds = self.jenkins.get_builds(pipeline_name, 10)
-
-            # Get detailed build info to check results
-            successful_builds = []
-            for build in builds:
-                try:
-                    build_info = self.jenkins.get_build_info(pipeline_name, build['number'])
-                    if build_info.get('result') == 'SUCCESS':
-                        successful_builds.append(build_info)
-                except Exception:
-                    continue
+            # Get recent builds with their results in one request
+            builds = await asyncio.to_thread(self.jenkins.get_builds, pipeline_name, 10, _BUILD_FIELDS)
 
-            if not successful_builds:
+            # Use the most recent successful build
+            latest_build = next((build for build in builds if build.get('result') == 'SUCCESS'), None)
+            if latest_build is None:
                 return {"error": "No successful builds found for analysis"}
 
-            # Use the most recent successful build
-            latest_build = successful_builds[0]
             build_number = latest_build["number"]
-
             await ctx.info(f"Analyzing build #{build_number} execution flow...")
 
-            # Get detailed execution data using Workflow API
-            execution_data = await self._get_execution_data(pipeline_name, build_number)
+            # Get detailed execution data using Workflow API, and the pipeline
+            # configuration alongside it; the two requests are independent
+            execution_data, pipeline_config = await asyncio.gather(
+                self._get_execution_data(pipeline_name, build_number),
+                self._get_pipeline_config(pipeline_name, ctx),
+            )
 
             if not execution_data:
                 return {"error": "Could not retrieve execution data"}
 
-            # Get additional pipeline configuration data
-            pipeline_config = await self._get_pipeline_config(pipeline_name, ctx)
-
-            # Reconstruct Jenkinsfile from execution data
-            jenkinsfile_content = await self._reconstruct_from_execution(execution_data, pipeline_config, ctx)
-
-            # Analyze pipeline structure
-            analysis = await self._analyze_pipeline_structure(execution_data, ctx)
+            # Reconstruct Jenkinsfile from execution data and analyze pipeline structure
+            jenkinsfile_content, analysis = await self._reconstruct_and_analyze(execution_data, pipeline_config, ctx)
 
             return {
                 "pipeline_name": pipeline_name,
@@ -76,15 +107,25 @@ class ExecutionAnalysisService:
 
     async def _get_execution_data(self, pipeline_name: str, build_number: int) -> dict[str, Any] | None:
         """Get detailed execution data from Jenkins Workflow API."""
-        try:
-            import requests
+        cache_key = (pipeline_name, build_number)
+        cached = self._execution_cache.get(cache_key)
+        if cached is not None:
+            self._execution_cache.move_to_end(cache_key)
+            return cached
 
-            # Get workflow API data
+        try:
+            # Get workflow API data over the client's pooled keep-alive session
             url = f"{self.jenkins.server_url}/job/{pipeline_name}/{build_number}/wfapi/describe"
-            response = requests.get(url, auth=(self.jenkins.username, self.jenkins.password))
+            response = await asyncio.to_thread(
+                self.jenkins.client._session.get, url, auth=(self.jenkins.username, self.jenkins.password), timeout=30
+            )
 
             if response.status_code == 200:
-                return response.json()
+                execution_data = response.json()
+                self._execution_cache[cache_key] = execution_data
+                if len(self._execution_cache) > _EXECUTION_CACHE_MAX_SIZE:
+                    self._execution_cache.popitem(last=False)
+                return execution_data
             else:
                 return None
         except Exception:
@@ -93,16 +134,38 @@ class ExecutionAnalysisService:
     async def _get_pipeline_config(self, pipeline_name: str, ctx: Context) -> dict[str, Any]:
         """Get pipeline configuration data from Jenkins API."""
         try:
-            import requests
+            # Revalidate a previously parsed config instead of downloading it again
+            cached = self._config_cache.get(pipeline_name)
+            validators = cached[0] if cached else None
 
-            # Get pipeline configuration
+            # Get pipeline configuration over the client's pooled keep-alive session
             config_url = f"{self.jenkins.server_url}/job/{pipeline_name}/config.xml"
-            response = requests.get(config_url, auth=(self.jenkins.username, self.jenkins.password))
+            response = await asyncio.to_thread(
+                self.jenkins.client._session.get, config_url,
+                auth=(self.jenkins.username, self.jenkins.password), headers=validators, timeout=30
+            )
+
+            if response.status_code == 304 and cached:
+                self._config_cache.move_to_end(pipeline_name)
+                return cached[2]
             
             config_data = {}
             if response.status_code == 200:
                 config_xml = response.text
-                config_data = await self._parse_config_xml(config_xml, ctx)
+                if cached and cached[1] == config_xml:
+                    config_data = cached[2]
+                else:
+                    config_data = await self._parse_config_xml(config_xml, ctx)
+
+                validators = {}
+                if etag := response.headers.get("ETag"):
+                    validators["If-None-Match"] = etag
+                if last_modified := response.headers.get("Last-Modified"):
+                    validators["If-Modified-Since"] = last_modified
+                self._config_cache[pipeline_name] = (validators, config_xml, config_data)
+                self._config_cache.move_to_end(pipeline_name)
+                if len(self._config_cache) > _CONFIG_CACHE_MAX_SIZE:
+                    self._config_cache.popitem(last=False)
             
             return config_data
         except Exception as e:
@@ -120,283 +183,234 @@ class ExecutionAnalysisService:
             "environment": []
         }
 
+        # Section tag -> (config key, parser); the first element of each section is used
+        section_parsers = {
+            "agent": ("agent", self._parse_agent_config),
+            "parameters": ("parameters", self._extract_parameters_from_xml),
+            "triggers": ("triggers", self._extract_triggers_from_xml),
+            "options": ("options", self._extract_options_from_xml),
+            "tools": ("tools", self._extract_tools_from_xml),
+            "envVars": ("environment", self._extract_environment_from_xml),
+        }
+
         try:
-            # Extract agent information
-            agent_match = re.search(r'<agent>(.*?)</agent>', config_xml, re.DOTALL)
-            if agent_match:
-                agent_content = agent_match.group(1)
-                config_data["agent"] = await self._parse_agent_config(agent_content)
-
-            # Extract parameters
-            params_match = re.search(r'<parameters>(.*?)</parameters>', config_xml, re.DOTALL)
-            if params_match:
-                params_content = params_match.group(1)
-                config_data["parameters"] = await self._extract_parameters_from_xml(params_content)
-
-            # Extract triggers
-            triggers_match = re.search(r'<triggers>(.*?)</triggers>', config_xml, re.DOTALL)
-            if triggers_match:
-                triggers_content = triggers_match.group(1)
-                config_data["triggers"] = await self._extract_triggers_from_xml(triggers_content)
-
-            # Extract options
-            options_match = re.search(r'<options>(.*?)</options>', config_xml, re.DOTALL)
-            if options_match:
-                options_content = options_match.group(1)
-                config_data["options"] = await self._extract_options_from_xml(options_content)
-
-            # Extract tools
-            tools_match = re.search(r'<tools>(.*?)</tools>', config_xml, re.DOTALL)
-            if tools_match:
-                tools_content = tools_match.group(1)
-                config_data["tools"] = await self._extract_tools_from_xml(tools_content)
-
-            # Extract environment variables
-            env_match = re.search(r'<envVars>(.*?)</envVars>', config_xml, re.DOTALL)
-            if env_match:
-                env_content = env_match.group(1)
-                config_data["environment"] = await self._extract_environment_from_xml(env_content)
+            # Stream the XML once and hand each section to its parser as it closes
+            for _, element in ET.iterparse(io.StringIO(config_xml)):
+                section = section_parsers.pop(element.tag, None)
+                if section is None:
+                    continue
+                key, parse = section
+                config_data[key] = parse(element)
+                element.clear()
+                if not section_parsers:
+                    break
 
         except Exception as e:
             await ctx.warning(f"Error parsing config XML: {str(e)}")
 
         return config_data
 
-    async def _parse_agent_config(self, agent_content: str) -> str:
+    def _parse_agent_config(self, agent: ET.Element) -> str:
         """Parse agent configuration from XML."""
-        if 'label' in agent_content:
-            label_match = re.search(r'<label>(.*?)</label>', agent_content)
-            if label_match:
-                return f"label('{label_match.group(1)}')"
-        elif 'docker' in agent_content:
-            docker_match = re.search(r'<image>(.*?)</image>', agent_content)
-            if docker_match:
-                return f"docker('{docker_match.group(1)}')"
-        elif 'dockerfile' in agent_content:
-            return await self._parse_dockerfile_agent(agent_content)
-        elif 'kubernetes' in agent_content:
+        # The agent type is the tag of its first child; a bare agent holds only text such as "none"
+        agent_type = next(iter(agent), None)
+        if agent_type is None:
+            return "none" if (agent.text or '').strip() == 'none' else "any"
+
+        if agent_type.tag == 'label':
+            return f"label('{agent_type.text or ''}')"
+        elif agent_type.tag == 'docker':
+            image = agent_type.findtext('image')
+            if image is not None:
+                return f"docker('{image}')"
+        elif agent_type.tag == 'dockerfile':
+            return self._parse_dockerfile_agent(agent_type)
+        elif agent_type.tag == 'kubernetes':
             return "kubernetes { /* Kubernetes agent config */ }"
-        elif 'node' in agent_content:
-            return await self._parse_node_agent(agent_content)
-        elif 'none' in agent_content:
-            return "none"
+        elif agent_type.tag == 'node':
+            return self._parse_node_agent(agent_type)
         return "any"
 
-    async def _parse_dockerfile_agent(self, agent_content: str) -> str:
+    @staticmethod
+    def _agent_options(agent: ET.Element, names: tuple[str, ...]) -> List[str]:
+        """Render the agent settings that are present as `name 'value'`, in the given order."""
+        return [
+            f"{name} '{value}'"
+            for name in names
+            if (value := agent.findtext(f'.//{name}')) is not None
+        ]
+
+    def _parse_dockerfile_agent(self, agent: ET.Element) -> str:
         """Parse dockerfile agent configuration."""
-        dockerfile_config = []
-        
-        # Check for basic dockerfile
-        if 'true' in agent_content or 'dockerfile' in agent_content.lower():
-            dockerfile_config.append("dockerfile true")
-        
-        # Check for dir option
-        dir_match = re.search(r'<dir>(.*?)</dir>', agent_content)
-        if dir_match:
-            dockerfile_config.append(f"dir '{dir_match.group(1)}'")
-        
-        # Check for filename option
-        filename_match = re.search(r'<filename>(.*?)</filename>', agent_content)
-        if filename_match:
-            dockerfile_config.append(f"filename '{filename_match.group(1)}'")
-        
-        # Check for additionalBuildArgs
-        build_args_match = re.search(r'<additionalBuildArgs>(.*?)</additionalBuildArgs>', agent_content)
-        if build_args_match:
-            dockerfile_config.append(f"additionalBuildArgs '{build_args_match.group(1)}'")
-        
-        # Check for args
-        args_match = re.search(r'<args>(.*?)</args>', agent_content)
-        if args_match:
-            dockerfile_config.append(f"args '{args_match.group(1)}'")
-        
-        # Check for label
-        label_match = re.search(r'<label>(.*?)</label>', agent_content)
-        if label_match:
-            dockerfile_config.append(f"label '{label_match.group(1)}'")
-        
-        if len(dockerfile_config) == 1 and dockerfile_config[0] == "dockerfile true":
+        options = self._agent_options(agent, ('dir', 'filename', 'additionalBuildArgs', 'args', 'label'))
+        if not options:
             return "dockerfile true"
-        else:
-            config_str = ",\n        ".join(dockerfile_config)
-            return f"dockerfile {{\n        {config_str}\n    }}"
 
-    async def _parse_node_agent(self, agent_content: str) -> str:
+        config_str = ",\n        ".join(("dockerfile true", *options))
+        return f"dockerfile {{\n        {config_str}\n    }}"
+
+    def _parse_node_agent(self, agent: ET.Element) -> str:
         """Parse node agent configuration."""
-        node_config = []
-        
-        # Check for label
-        label_match = re.search(r'<label>(.*?)</label>', agent_content)
-        if label_match:
-            node_config.append(f"label '{label_match.group(1)}'")
-        
-        # Check for customWorkspace
-        workspace_match = re.search(r'<customWorkspace>(.*?)</customWorkspace>', agent_content)
-        if workspace_match:
-            node_config.append(f"customWorkspace '{workspace_match.group(1)}'")
-        
-        if not node_config:
+        options = self._agent_options(agent, ('label', 'customWorkspace'))
+        if not options:
             return "node { /* Node agent config */ }"
-        
-        config_str = ",\n        ".join(node_config)
+
+        config_str = ",\n        ".join(options)
         return f"node {{\n        {config_str}\n    }}"
 
-    async def _extract_parameters_from_xml(self, params_xml: str) -> List[str]:
+    def _extract_parameters_from_xml(self, params: ET.Element) -> List[str]:
         """Extract parameters from XML configuration."""
         parameters = []
         
         # String parameters
-        string_params = re.findall(r'<hudson\.model\.StringParameterDefinition>.*?<name>(.*?)</name>.*?<defaultValue>(.*?)</defaultValue>.*?<description>(.*?)</description>', params_xml, re.DOTALL)
-        for name, default, desc in string_params:
-            parameters.append(f"string(name: '{name}', defaultValue: '{default}', description: '{desc.strip()}')")
+        for param in params.iter('hudson.model.StringParameterDefinition'):
+            name, default, desc = (param.findtext(field) for field in ('name', 'defaultValue', 'description'))
+            if None not in (name, default, desc):
+                parameters.append(f"string(name: '{name}', defaultValue: '{default}', description: '{desc.strip()}')")
         
         # Choice parameters
-        choice_params = re.findall(r'<hudson\.model\.ChoiceParameterDefinition>.*?<name>(.*?)</name>.*?<choices class="java\.util\.Arrays\$ArrayList">.*?<a class="string-array">(.*?)</a>.*?<description>(.*?)</description>', params_xml, re.DOTALL)
-        for name, choices_xml, desc in choice_params:
-            choices = re.findall(r'<string>(.*?)</string>', choices_xml)
-            choices_str = "', '".join(choices)
-            parameters.append(f"choice(name: '{name}', choices: ['{choices_str}'], description: '{desc.strip()}')")
+        for param in params.iter('hudson.model.ChoiceParameterDefinition'):
+            name, desc = param.findtext('name'), param.findtext('description')
+            choices_array = param.find("choices[@class='java.util.Arrays$ArrayList']/a[@class='string-array']")
+            if None not in (name, desc, choices_array):
+                choices_str = "', '".join(choice.text or '' for choice in choices_array.iter('string'))
+                parameters.append(f"choice(name: '{name}', choices: ['{choices_str}'], description: '{desc.strip()}')")
         
         # Boolean parameters
-        bool_params = re.findall(r'<hudson\.model\.BooleanParameterDefinition>.*?<name>(.*?)</name>.*?<defaultValue>(.*?)</defaultValue>.*?<description>(.*?)</description>', params_xml, re.DOTALL)
-        for name, default, desc in bool_params:
-            default_val = "true" if default.lower() == "true" else "false"
-            parameters.append(f"booleanParam(name: '{name}', defaultValue: {default_val}, description: '{desc.strip()}')")
+        for param in params.iter('hudson.model.BooleanParameterDefinition'):
+            name, default, desc = (param.findtext(field) for field in ('name', 'defaultValue', 'description'))
+            if None not in (name, default, desc):
+                default_val = "true" if default.lower() == "true" else "false"
+                parameters.append(f"booleanParam(name: '{name}', defaultValue: {default_val}, description: '{desc.strip()}')")
         
         # Password parameters
-        password_params = re.findall(r'<hudson\.model\.PasswordParameterDefinition>.*?<name>(.*?)</name>.*?<description>(.*?)</description>', params_xml, re.DOTALL)
-        for name, desc in password_params:
-            parameters.append(f"password(name: '{name}', description: '{desc.strip()}')")
+        for param in params.iter('hudson.model.PasswordParameterDefinition'):
+            name, desc = param.findtext('name'), param.findtext('description')
+            if None not in (name, desc):
+                parameters.append(f"password(name: '{name}', description: '{desc.strip()}')")
         
         # Text parameters
-        text_params = re.findall(r'<hudson\.model\.TextParameterDefinition>.*?<name>(.*?)</name>.*?<defaultValue>(.*?)</defaultValue>.*?<description>(.*?)</description>', params_xml, re.DOTALL)
-        for name, default, desc in text_params:
-            parameters.append(f"text(name: '{name}', defaultValue: '''{default}''', description: '{desc.strip()}')")
+        for param in params.iter('hudson.model.TextParameterDefinition'):
+            name, default, desc = (param.findtext(field) for field in ('name', 'defaultValue', 'description'))
+            if None not in (name, default, desc):
+                parameters.append(f"text(name: '{name}', defaultValue: '''{default}''', description: '{desc.strip()}')")
         
         return parameters
 
-    async def _extract_triggers_from_xml(self, triggers_xml: str) -> List[str]:
+    def _extract_triggers_from_xml(self, triggers_element: ET.Element) -> List[str]:
         """Extract triggers from XML configuration."""
         triggers = []
         
         # GitHub webhook trigger
-        if 'GitHubPushTrigger' in triggers_xml:
+        if any('GitHubPushTrigger' in element.tag for element in triggers_element.iter()):
             triggers.append("githubPush()")
         
         # Poll SCM trigger
-        if 'hudson.triggers.SCMTrigger' in triggers_xml:
-            schedule_match = re.search(r'<spec>(.*?)</spec>', triggers_xml)
-            if schedule_match:
-                triggers.append(f"pollSCM('{schedule_match.group(1)}')")
+        schedule = triggers_element.findtext('.//hudson.triggers.SCMTrigger/spec')
+        if schedule is not None:
+            triggers.append(f"pollSCM('{schedule}')")
         
         # Cron trigger
-        if 'hudson.triggers.TimerTrigger' in triggers_xml:
-            schedule_match = re.search(r'<spec>(.*?)</spec>', triggers_xml)
-            if schedule_match:
-                triggers.append(f"cron('{schedule_match.group(1)}')")
+        schedule = triggers_element.findtext('.//hudson.triggers.TimerTrigger/spec')
+        if schedule is not None:
+            triggers.append(f"cron('{schedule}')")
         
         # Upstream trigger
-        if 'hudson.triggers.UpstreamTrigger' in triggers_xml:
-            upstream_match = re.search(r'<upstreamProjects>(.*?)</upstreamProjects>', triggers_xml)
-            if upstream_match:
-                projects = upstream_match.group(1).strip()
-                triggers.append(f"upstream(upstreamProjects: '{projects}')")
+        projects = triggers_element.findtext('.//hudson.triggers.UpstreamTrigger//upstreamProjects')
+        if projects is not None:
+            triggers.append(f"upstream(upstreamProjects: '{projects.strip()}')")
         
         return triggers
 
-    async def _extract_options_from_xml(self, options_xml: str) -> List[str]:
+    def _extract_options_from_xml(self, options_element: ET.Element) -> List[str]:
         """Extract options from XML configuration."""
         options = []
+
+        # Jenkins names an extension by its element tag or, when it is nested as a
+        # describable such as <strategy class="hudson.tasks.LogRotator">, by its class
+        names = set()
+        for element in options_element.iter():
+            names.add(element.tag)
+            if class_name := element.get('class'):
+                names.add(class_name)
         
         # Timeout
-        if 'hudson.plugins.build__timeout.BuildTimeoutWrapper' in options_xml:
-            timeout_match = re.search(r'<timeoutMinutes>(.*?)</timeoutMinutes>', options_xml)
-            if timeout_match:
-                minutes = timeout_match.group(1)
+        if 'hudson.plugins.build__timeout.BuildTimeoutWrapper' in names:
+            minutes = options_element.findtext('.//timeoutMinutes')
+            if minutes is not None:
                 options.append(f"timeout(time: {minutes}, unit: 'MINUTES')")
         
         # Retry
-        if 'hudson.plugins.retry.RetryBuildStep' in options_xml:
-            retry_match = re.search(r'<retryCount>(.*?)</retryCount>', options_xml)
-            if retry_match:
-                count = retry_match.group(1)
+        if 'hudson.plugins.retry.RetryBuildStep' in names:
+            count = options_element.findtext('.//retryCount')
+            if count is not None:
                 options.append(f"retry({count})")
         
         # Timestamps
-        if 'hudson.plugins.timestamper.TimestamperBuildWrapper' in options_xml:
+        if 'hudson.plugins.timestamper.TimestamperBuildWrapper' in names:
             options.append("timestamps()")
         
         # ANSI Color
-        if 'hudson.plugins.ansicolor.AnsiColorBuildWrapper' in options_xml:
-            color_match = re.search(r'<colorMapName>(.*?)</colorMapName>', options_xml)
-            if color_match:
-                color = color_match.group(1)
-                options.append(f"ansiColor('{color}')")
-            else:
-                options.append("ansiColor('xterm')")
+        if 'hudson.plugins.ansicolor.AnsiColorBuildWrapper' in names:
+            color = options_element.findtext('.//colorMapName')
+            options.append(f"ansiColor('{color if color is not None else 'xterm'}')")
         
         # Skip default checkout
-        if 'hudson.plugins.workspacecleaner.WorkspaceCleaner' in options_xml:
+        if 'hudson.plugins.workspacecleaner.WorkspaceCleaner' in names:
             options.append("skipDefaultCheckout()")
         
         # Build discarder
-        if 'hudson.tasks.LogRotator' in options_xml:
-            num_keep_match = re.search(r'<numToKeep>(.*?)</numToKeep>', options_xml)
-            if num_keep_match:
-                num_keep = num_keep_match.group(1)
+        if 'hudson.tasks.LogRotator' in names:
+            num_keep = options_element.findtext('.//numToKeep')
+            if num_keep is not None:
                 options.append(f"buildDiscarder(logRotator(numToKeepStr: '{num_keep}'))")
         
         # Disable concurrent builds
-        if 'hudson.model.BuildDiscarderProperty' in options_xml:
+        if 'hudson.model.BuildDiscarderProperty' in names:
             options.append("disableConcurrentBuilds()")
         
         return options
 
-    async def _extract_tools_from_xml(self, tools_xml: str) -> List[str]:
+    def _extract_tools_from_xml(self, tools_element: ET.Element) -> List[str]:
         """Extract tools from XML configuration."""
         tools = []
         
-        # Maven
-        maven_match = re.search(r'<hudson\.plugins\.maven\.MavenInstallation>.*?<name>(.*?)</name>', tools_xml, re.DOTALL)
-        if maven_match:
-            tools.append(f"maven '{maven_match.group(1)}'")
-        
-        # JDK
-        jdk_match = re.search(r'<hudson\.model\.JDK>.*?<name>(.*?)</name>', tools_xml, re.DOTALL)
-        if jdk_match:
-            tools.append(f"jdk '{jdk_match.group(1)}'")
-        
-        # Gradle
-        gradle_match = re.search(r'<hudson\.plugins\.gradle\.GradleInstallation>.*?<name>(.*?)</name>', tools_xml, re.DOTALL)
-        if gradle_match:
-            tools.append(f"gradle '{gradle_match.group(1)}'")
-        
-        # NodeJS
-        nodejs_match = re.search(r'<hudson\.plugins\.nodejs\.tools\.NodeJSInstallation>.*?<name>(.*?)</name>', tools_xml, re.DOTALL)
-        if nodejs_match:
-            tools.append(f"nodejs '{nodejs_match.group(1)}'")
+        for tool, installation in (
+            ('maven', 'hudson.plugins.maven.MavenInstallation'),
+            ('jdk', 'hudson.model.JDK'),
+            ('gradle', 'hudson.plugins.gradle.GradleInstallation'),
+            ('nodejs', 'hudson.plugins.nodejs.tools.NodeJSInstallation'),
+        ):
+            name = tools_element.findtext(f'.//{installation}/name')
+            if name is not None:
+                tools.append(f"{tool} '{name}'")
         
         return tools
 
-    async def _extract_environment_from_xml(self, env_xml: str) -> List[str]:
+    def _extract_environment_from_xml(self, env_element: ET.Element) -> List[str]:
         """Extract environment variables from XML configuration."""
         env_vars = []
         
         # String environment variables
-        string_envs = re.findall(r'<hudson\.model\.StringParameterValue>.*?<name>(.*?)</name>.*?<value>(.*?)</value>', env_xml, re.DOTALL)
-        for name, value in string_envs:
-            env_vars.append(f"{name} = '{value}'")
+        for env in env_element.iter('hudson.model.StringParameterValue'):
+            name, value = env.findtext('name'), env.findtext('value')
+            if None not in (name, value):
+                env_vars.append(f"{name} = '{value}'")
         
         # Credential environment variables
-        cred_envs = re.findall(r'<hudson\.plugins\.credentialsbinding\.impl\.StringBinding>.*?<variable>(.*?)</variable>.*?<credentialId>(.*?)</credentialId>', env_xml, re.DOTALL)
-        for var, cred_id in cred_envs:
-            env_vars.append(f"{var} = credentials('{cred_id}')")
+        for binding in env_element.iter('hudson.plugins.credentialsbinding.impl.StringBinding'):
+            var, cred_id = binding.findtext('variable'), binding.findtext('credentialId')
+            if None not in (var, cred_id):
+                env_vars.append(f"{var} = credentials('{cred_id}')")
         
         return env_vars
 
-    async def _reconstruct_from_execution(self, execution_data: dict[str, Any], pipeline_config: dict[str, Any], ctx: Context) -> str:
-        """Reconstruct Jenkinsfile content from execution data."""
+    async def _reconstruct_and_analyze(
+        self, execution_data: dict[str, Any], pipeline_config: dict[str, Any], ctx: Context
+    ) -> tuple[str, dict[str, Any]]:
+        """Reconstruct Jenkinsfile content from execution data and analyze its structure in one pass over the stages."""
         await ctx.info("Reconstructing Jenkinsfile from execution flow...")
+        await ctx.info("Analyzing pipeline structure...")
 
         jenkinsfile_lines = []
 
@@ -408,72 +422,35 @@ class ExecutionAnalysisService:
         jenkinsfile_lines.append(f"    agent {agent}")
         jenkinsfile_lines.append("")
 
-        # Add parameters (from config)
-        parameters = pipeline_config.get("parameters", [])
-        if parameters:
-            jenkinsfile_lines.append("    parameters {")
-            for param in parameters:
-                jenkinsfile_lines.append(f"        {param}")
-            jenkinsfile_lines.append("    }")
-            jenkinsfile_lines.append("")
-
-        # Add triggers (from config)
-        triggers = pipeline_config.get("triggers", [])
-        if triggers:
-            jenkinsfile_lines.append("    triggers {")
-            for trigger in triggers:
-                jenkinsfile_lines.append(f"        {trigger}")
-            jenkinsfile_lines.append("    }")
-            jenkinsfile_lines.append("")
-
-        # Add options (from config)
-        options = pipeline_config.get("options", [])
-        if options:
-            jenkinsfile_lines.append("    options {")
-            for option in options:
-                jenkinsfile_lines.append(f"        {option}")
-            jenkinsfile_lines.append("    }")
-            jenkinsfile_lines.append("")
-
-        # Add tools (from config)
-        tools = pipeline_config.get("tools", [])
-        if tools:
-            jenkinsfile_lines.append("    tools {")
-            for tool in tools:
-                jenkinsfile_lines.append(f"        {tool}")
-            jenkinsfile_lines.append("    }")
-            jenkinsfile_lines.append("")
+        # Add parameters, triggers, options and tools (from config)
+        for section in ("parameters", "triggers", "options", "tools"):
+            self._append_section(jenkinsfile_lines, section, pipeline_config.get(section, []))
 
         # Add environment variables (from config and execution data)
         env_vars = pipeline_config.get("environment", [])
-        exec_env_vars = await self._extract_environment_variables(execution_data, ctx)
-        all_env_vars = env_vars + exec_env_vars
-        
-        if all_env_vars:
-            jenkinsfile_lines.append("    environment {")
-            for var in all_env_vars:
-                jenkinsfile_lines.append(f"        {var}")
-            jenkinsfile_lines.append("    }")
-            jenkinsfile_lines.append("")
+        exec_env_vars = self._extract_environment_variables(execution_data, ctx)
+        self._append_section(jenkinsfile_lines, "environment", env_vars + exec_env_vars)
 
         # Add stages
         jenkinsfile_lines.append("    stages {")
 
         # Analyze stages from execution data
         stages = execution_data.get("stages", [])
+        analysis = self._new_structure_analysis(stages, execution_data.get("durationMillis", 0))
         for stage in stages:
+            self._analyze_stage(analysis, stage)
             stage_name = stage.get("name", "Unknown")
             
             # Check if this is a matrix stage
-            if await self._is_matrix_stage(stage, execution_data, ctx):
+            if self._is_matrix_stage(stage, execution_data, ctx):
                 jenkinsfile_lines.append(f"        stage('{stage_name}') {{")
-                matrix_content = await self._reconstruct_matrix_stage(stage, execution_data, ctx)
+                matrix_content = self._reconstruct_matrix_stage(stage, execution_data, ctx)
                 jenkinsfile_lines.extend(matrix_content)
                 jenkinsfile_lines.append("        }")
             else:
                 jenkinsfile_lines.append(f"        stage('{stage_name}') {{")
                 # Reconstruct stage content based on actual execution
-                stage_content = await self._reconstruct_stage_content(stage, execution_data, ctx)
+                stage_content = self._reconstruct_stage_content(stage, execution_data, ctx)
                 jenkinsfile_lines.extend(stage_content)
                 jenkinsfile_lines.append("        }")
             
@@ -483,19 +460,28 @@ class ExecutionAnalysisService:
         jenkinsfile_lines.append("")
 
         # Add post actions
-        post_actions = await self._extract_post_actions(execution_data, ctx)
-        if post_actions:
-            jenkinsfile_lines.append("    post {")
-            for action in post_actions:
-                jenkinsfile_lines.append(f"        {action}")
-            jenkinsfile_lines.append("    }")
-            jenkinsfile_lines.append("")
+        post_actions = self._extract_post_actions(execution_data, ctx)
+        self._append_section(jenkinsfile_lines, "post", post_actions)
 
         jenkinsfile_lines.append("}")
 
-        return "\n".join(jenkinsfile_lines)
+        # Compile technologies list
+        analysis["technologies_used"] = [
+            technology for flag, technology in _TECHNOLOGY_FLAGS if analysis[flag]
+        ]
+
+        return "\n".join(jenkinsfile_lines), analysis
+
+    @staticmethod
+    def _append_section(jenkinsfile_lines: List[str], name: str, entries: List[str]) -> None:
+        """Append a top-level `name { ... }` section and a blank line, unless it has no entries."""
+        if entries:
+            jenkinsfile_lines.append(f"    {name} {{")
+            jenkinsfile_lines.extend(f"        {entry}" for entry in entries)
+            jenkinsfile_lines.append("    }")
+            jenkinsfile_lines.append("")
 
-    async def _extract_environment_variables(self, execution_data: dict[str, Any], ctx: Context) -> List[str]:
+    def _extract_environment_variables(self, execution_data: dict[str, Any], ctx: Context) -> List[str]:
         """Extract environment variables from execution data."""
         env_vars = []
         
@@ -506,24 +492,24 @@ class ExecutionAnalysisService:
             # Look for common environment variable patterns
             if "env." in stage_name or "environment" in stage_name.lower():
                 # Extract from stage name or logs
-                env_matches = re.findall(r'env\.(\w+)\s*=\s*([^\s]+)', stage_name)
+                env_matches = _ENV_ASSIGNMENT_RE.findall(stage_name)
                 for var_name, var_value in env_matches:
                     env_vars.append(f"{var_name} = '{var_value}'")
         
         return env_vars
 
-    async def _reconstruct_stage_content(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
+    def _reconstruct_stage_content(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
         """Reconstruct individual stage content based on execution data."""
         stage_lines = []
         stage_name = stage.get("name", "")
 
         # Check for stage-level agent
-        stage_agent = await self._extract_stage_agent(stage, execution_data, ctx)
+        stage_agent = self._extract_stage_agent(stage, execution_data, ctx)
         if stage_agent:
             stage_lines.append(f"            agent {stage_agent}")
 
         # Check for stage-level environment
-        stage_env = await self._extract_stage_environment(stage, execution_data, ctx)
+        stage_env = self._extract_stage_environment(stage, execution_data, ctx)
         if stage_env:
             stage_lines.append("            environment {")
             for env_var in stage_env:
@@ -531,7 +517,7 @@ class ExecutionAnalysisService:
             stage_lines.append("            }")
 
         # Check for stage-level tools
-        stage_tools = await self._extract_stage_tools(stage, execution_data, ctx)
+        stage_tools = self._extract_stage_tools(stage, execution_data, ctx)
         if stage_tools:
             stage_lines.append("            tools {")
             for tool in stage_tools:
@@ -539,14 +525,14 @@ class ExecutionAnalysisService:
             stage_lines.append("            }")
 
         # Check for when conditions
-        when_condition = await self._extract_when_condition(stage, execution_data, ctx)
+        when_condition = self._extract_when_condition(stage, execution_data, ctx)
         if when_condition:
             stage_lines.append("            when {")
             stage_lines.append(f"                {when_condition}")
             stage_lines.append("            }")
 
         # Check for input step
-        input_step = await self._extract_input_step(stage, execution_data, ctx)
+        input_step = self._extract_input_step(stage, execution_data, ctx)
         if input_step:
             stage_lines.append("            steps {")
             stage_lines.append(f"                {input_step}")
@@ -555,7 +541,7 @@ class ExecutionAnalysisService:
         elif "parallel" in stage_name.lower() or "Parallel" in stage_name:
             stage_lines.append("            parallel {")
             # Extract parallel branches from execution data
-            parallel_branches = await self._extract_parallel_branches(stage, execution_data, ctx)
+            parallel_branches = self._extract_parallel_branches(stage, execution_data, ctx)
             for branch_name, branch_content in parallel_branches.items():
                 stage_lines.append(f"                {branch_name} {{")
                 stage_lines.extend(branch_content)
@@ -566,13 +552,13 @@ class ExecutionAnalysisService:
             stage_lines.append("            steps {")
             
             # Extract actual steps from execution data
-            steps = await self._extract_stage_steps(stage, execution_data, ctx)
+            steps = self._extract_stage_steps(stage, execution_data, ctx)
             stage_lines.extend(steps)
             
             stage_lines.append("            }")
 
         # Check for stage-level post actions
-        stage_post = await self._extract_stage_post_actions(stage, execution_data, ctx)
+        stage_post = self._extract_stage_post_actions(stage, execution_data, ctx)
         if stage_post:
             stage_lines.append("            post {")
             for action in stage_post:
@@ -581,36 +567,29 @@ class ExecutionAnalysisService:
 
         return stage_lines
 
-    async def _extract_stage_agent(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Optional[str]:
+    def _extract_stage_agent(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Optional[str]:
         """Extract stage-level agent configuration."""
         # This would need to be implemented based on actual execution data structure
         return None
 
-    async def _extract_stage_environment(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
+    def _extract_stage_environment(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
         """Extract stage-level environment variables."""
         # This would need to be implemented based on actual execution data structure
         return []
 
-    async def _extract_stage_tools(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
+    def _extract_stage_tools(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
         """Extract stage-level tools."""
         # This would need to be implemented based on actual execution data structure
         return []
 
-    async def _extract_when_condition(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Optional[str]:
+    def _extract_when_condition(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Optional[str]:
         """Extract when condition for stage."""
-        stage_name = stage.get("name", "")
+        lowered_name = stage.get("name", "").lower()
         
         # Look for common when conditions
-        if "branch" in stage_name.lower():
-            return "branch 'main'"
-        elif "environment" in stage_name.lower():
-            return "environment name: 'DEPLOY_TO', value: 'production'"
-        elif "not" in stage_name.lower():
-            return "not { branch 'develop' }"
-        
-        return None
+        return next((condition for keyword, condition in _WHEN_CONDITIONS if keyword in lowered_name), None)
 
-    async def _extract_parallel_branches(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Dict[str, List[str]]:
+    def _extract_parallel_branches(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Dict[str, List[str]]:
         """Extract parallel branches from stage execution data."""
         branches = {}
         
@@ -624,48 +603,37 @@ class ExecutionAnalysisService:
         
         return branches
 
-    async def _extract_stage_steps(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
+    def _extract_stage_steps(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
         """Extract actual steps from stage execution data."""
-        steps = []
         stage_name = stage.get("name", "")
+        lowered_name = stage_name.lower()
 
         # Check for script step first
-        script_step = await self._extract_script_step(stage, execution_data, ctx)
+        script_step = self._extract_script_step(stage, execution_data, ctx)
         if script_step:
-            steps.append(f"                {script_step}")
-        # Analyze stage type and extract real steps
-        elif "checkout" in stage_name.lower() or "scm" in stage_name.lower():
-            steps.append("                checkout scm")
-        elif "init" in stage_name.lower() or "setup" in stage_name.lower():
-            steps.append("                script {")
-            steps.append("                    echo 'Initializing build environment'")
-            steps.append("                }")
-        elif "build" in stage_name.lower() or "compile" in stage_name.lower():
-            steps.append("                script {")
-            steps.append("                    echo 'Building application'")
-            steps.append("                }")
-        elif "test" in stage_name.lower():
-            steps.append("                script {")
-            steps.append("                    echo 'Running tests'")
-            steps.append("                }")
-        elif "deploy" in stage_name.lower():
-            steps.append("                script {")
-            steps.append("                    echo 'Deploying application'")
-            steps.append("                }")
-        else:
-            # Generic stage reconstruction
-            steps.append("                script {")
-            steps.append(f"                    echo 'Executing {stage_name}'")
-            steps.append("                }")
+            return [f"                {script_step}"]
 
-        return steps
-
-    async def _extract_stage_post_actions(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
+        # Analyze stage type and extract real steps
+        if "checkout" in lowered_name or "scm" in lowered_name:
+            return ["                checkout scm"]
+
+        # Generic stage reconstruction unless a keyword names the stage type
+        message = next(
+            (message for keywords, message in _STAGE_STEP_MESSAGES if any(keyword in lowered_name for keyword in keywords)),
+            f"Executing {stage_name}",
+        )
+        return [
+            "                script {",
+            f"                    echo '{message}'",
+            "                }",
+        ]
+
+    def _extract_stage_post_actions(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
         """Extract stage-level post actions."""
         # This would need to be implemented based on actual execution data structure
         return []
 
-    async def _extract_post_actions(self, execution_data: dict[str, Any], ctx: Context) -> List[str]:
+    def _extract_post_actions(self, execution_data: dict[str, Any], ctx: Context) -> List[str]:
         """Extract post-build actions from execution data."""
         post_actions = []
         
@@ -683,32 +651,32 @@ class ExecutionAnalysisService:
 
         return post_actions
 
-    async def _is_matrix_stage(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> bool:
+    def _is_matrix_stage(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> bool:
         """Check if a stage is a matrix stage."""
         stage_name = stage.get("name", "")
         # Look for matrix indicators in stage name or execution data
         return "matrix" in stage_name.lower() or "parallel" in stage_name.lower()
 
-    async def _reconstruct_matrix_stage(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
+    def _reconstruct_matrix_stage(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
         """Reconstruct matrix stage content."""
         matrix_lines = []
         
         matrix_lines.append("            matrix {")
         
         # Add matrix agent if present
-        matrix_agent = await self._extract_matrix_agent(stage, execution_data, ctx)
+        matrix_agent = self._extract_matrix_agent(stage, execution_data, ctx)
         if matrix_agent:
             matrix_lines.append(f"                agent {matrix_agent}")
         
         # Add matrix when condition
-        matrix_when = await self._extract_matrix_when(stage, execution_data, ctx)
+        matrix_when = self._extract_matrix_when(stage, execution_data, ctx)
         if matrix_when:
             matrix_lines.append("                when {")
             matrix_lines.append(f"                    {matrix_when}")
             matrix_lines.append("                }")
         
         # Add axes
-        axes = await self._extract_matrix_axes(stage, execution_data, ctx)
+        axes = self._extract_matrix_axes(stage, execution_data, ctx)
         if axes:
             matrix_lines.append("                axes {")
             for axis in axes:
@@ -716,7 +684,7 @@ class ExecutionAnalysisService:
             matrix_lines.append("                }")
         
         # Add excludes
-        excludes = await self._extract_matrix_excludes(stage, execution_data, ctx)
+        excludes = self._extract_matrix_excludes(stage, execution_data, ctx)
         if excludes:
             matrix_lines.append("                excludes {")
             for exclude in excludes:
@@ -724,7 +692,7 @@ class ExecutionAnalysisService:
             matrix_lines.append("                }")
         
         # Add matrix stages
-        matrix_stages = await self._extract_matrix_stages(stage, execution_data, ctx)
+        matrix_stages = self._extract_matrix_stages(stage, execution_data, ctx)
         if matrix_stages:
             matrix_lines.append("                stages {")
             for matrix_stage in matrix_stages:
@@ -735,17 +703,17 @@ class ExecutionAnalysisService:
         
         return matrix_lines
 
-    async def _extract_matrix_agent(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Optional[str]:
+    def _extract_matrix_agent(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Optional[str]:
         """Extract matrix agent configuration."""
         # This would need to be implemented based on actual execution data structure
         return None
 
-    async def _extract_matrix_when(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Optional[str]:
+    def _extract_matrix_when(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Optional[str]:
         """Extract matrix when condition."""
         # This would need to be implemented based on actual execution data structure
         return None
 
-    async def _extract_matrix_axes(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
+    def _extract_matrix_axes(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
         """Extract matrix axes configuration."""
         axes = []
         
@@ -762,7 +730,7 @@ class ExecutionAnalysisService:
         
         return axes
 
-    async def _extract_matrix_excludes(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
+    def _extract_matrix_excludes(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
         """Extract matrix excludes configuration."""
         excludes = []
         
@@ -780,7 +748,7 @@ class ExecutionAnalysisService:
         
         return excludes
 
-    async def _extract_matrix_stages(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
+    def _extract_matrix_stages(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> List[str]:
         """Extract matrix stages configuration."""
         matrix_stages = []
         
@@ -799,7 +767,7 @@ class ExecutionAnalysisService:
         
         return matrix_stages
 
-    async def _extract_input_step(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Optional[str]:
+    def _extract_input_step(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Optional[str]:
         """Extract input step configuration."""
         stage_name = stage.get("name", "")
         
@@ -818,7 +786,7 @@ class ExecutionAnalysisService:
         
         return None
 
-    async def _extract_script_step(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Optional[str]:
+    def _extract_script_step(self, stage: dict[str, Any], execution_data: dict[str, Any], ctx: Context) -> Optional[str]:
         """Extract script step configuration."""
         stage_name = stage.get("name", "")
         
@@ -835,14 +803,10 @@ class ExecutionAnalysisService:
         
         return None
 
-    async def _analyze_pipeline_structure(self, execution_data: dict[str, Any], ctx: Context) -> dict[str, Any]:
-        """Analyze pipeline structure and provide insights."""
-        await ctx.info("Analyzing pipeline structure...")
-
-        stages = execution_data.get("stages", [])
-        total_duration = execution_data.get("durationMillis", 0)
-
-        analysis = {
+    @staticmethod
+    def _new_structure_analysis(stages: List[dict[str, Any]], total_duration: int) -> dict[str, Any]:
+        """Start a pipeline structure analysis; stages are added with _analyze_stage."""
+        return {
             "total_stages": len(stages),
             "total_duration_ms": total_duration,
             "total_duration_formatted": f"{total_duration / 1000:.1f} seconds",
@@ -855,44 +819,33 @@ class ExecutionAnalysisService:
             "jenkins_library_usage": False
         }
 
-        # Analyze each stage
-        for stage in stages:
-            stage_name = stage.get("name", "")
-            stage_duration = stage.get("durationMillis", 0)
-            stage_percentage = (stage_duration / total_duration * 100) if total_duration > 0 else 0
-
-            analysis["stage_breakdown"].append({
-                "name": stage_name,
-                "duration_ms": stage_duration,
-                "duration_formatted": f"{stage_duration / 1000:.1f} seconds",
-                "percentage": stage_percentage
-            })
-
-            # Detect technologies
-            if "aws" in stage_name.lower() or "ec2" in stage_name.lower():
-                analysis["aws_integration"] = True
-            if "k8s" in stage_name.lower() or "kubernetes" in stage_name.lower():
-                analysis["kubernetes_integration"] = True
-            if "docker" in stage_name.lower():
-                analysis["docker_usage"] = True
-            if "helm" in stage_name.lower():
-                analysis["helm_usage"] = True
-            if "library" in stage_name.lower():
-                analysis["jenkins_library_usage"] = True
-
-        # Compile technologies list
-        if analysis["aws_integration"]:
-            analysis["technologies_used"].append("AWS")
-        if analysis["kubernetes_integration"]:
-            analysis["technologies_used"].append("Kubernetes")
-        if analysis["docker_usage"]:
-            analysis["technologies_used"].append("Docker")
-        if analysis["helm_usage"]:
-            analysis["technologies_used"].append("Helm")
-        if analysis["jenkins_library_usage"]:
-            analysis["technologies_used"].append("Jenkins Shared Libraries")
-
-        return analysis
+    @staticmethod
+    def _analyze_stage(analysis: dict[str, Any], stage: dict[str, Any]) -> None:
+        """Add a stage's duration breakdown and detected technologies to a structure analysis."""
+        stage_name = stage.get("name", "")
+        stage_duration = stage.get("durationMillis", 0)
+        total_duration = analysis["total_duration_ms"]
+        stage_percentage = (stage_duration / total_duration * 100) if total_duration > 0 else 0
+
+        analysis["stage_breakdown"].append({
+            "name": stage_name,
+            "duration_ms": stage_duration,
+            "duration_formatted": f"{stage_duration / 1000:.1f} seconds",
+            "percentage": stage_percentage
+        })
+
+        # Detect technologies
+        lowered_name = stage_name.lower()
+        if "aws" in lowered_name or "ec2" in lowered_name:
+            analysis["aws_integration"] = True
+        if "k8s" in lowered_name or "kubernetes" in lowered_name:
+            analysis["kubernetes_integration"] = True
+        if "docker" in lowered_name:
+            analysis["docker_usage"] = True
+        if "helm" in lowered_name:
+            analysis["helm_usage"] = True
+        if "library" in lowered_name:
+            analysis["jenkins_library_usage"] = True
 
     async def suggest_improvements(self, pipeline_name: str, jenkinsfile: str, analysis: dict[str, Any], ctx: Context) -> dict[str, Any]:
         """Suggest improvements for the reconstructed Jenkinsfile."""
@@ -1,12 +1,32 @@
 """Jenkins service wrapper for API operations."""
 
+import json
 import logging
+import sys
 from typing import Any
 
 import jenkins
+import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive pool sized for concurrent asyncio.to_thread callers (requests defaults to 10)
+POOL_CONNECTIONS = 20
+POOL_MAXSIZE = 50
+
+# Job builds restricted to selected fields and the most recent entries
+BUILDS_TREE = '%(folder_url)sjob/%(short_name)s/api/json?tree=builds[%(fields)s]{0,%(limit)s}'
+
+
+def _intern_results(builds: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Intern build result strings so comparisons against constants hit the identity fast path."""
+    for build in builds:
+        result = build.get('result')
+        if isinstance(result, str):
+            build['result'] = sys.intern(result)
+    return builds
+
 
 class JenkinsService:
     """Jenkins API service wrapper."""
@@ -21,6 +41,12 @@ class JenkinsService:
         """Initialize Jenkins client."""
         try:
             self.client = jenkins.Jenkins(url, username=username, password=token)
+            session = self.client._session
+            session.mount(url, HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE,
+                max_retries=session.get_adapter(url).max_retries,
+            ))
             self.username = username
             self.password = token
             self.server_url = url
@@ -66,13 +92,27 @@ class JenkinsService:
             raise ValueError("Jenkins not initialized")
         return self.client.get_job_info(job_name)
 
-    def get_builds(self, job_name: str, limit: int = 20) -> list[dict[str, Any]]:
-        """Get builds for a job."""
+    def get_builds(self, job_name: str, limit: int = 20, fields: tuple[str, ...] | None = None) -> list[dict[str, Any]]:
+        """Get builds for a job.
+
+        When ``fields`` is given, Jenkins is asked (via the ``tree`` query) for only
+        those build attributes and only the first ``limit`` builds.
+        """
         if not self.client:
             raise ValueError("Jenkins not initialized")
+        if fields:
+            folder_url, short_name = self.client._get_job_folder(job_name)
+            url = self.client._build_url(BUILDS_TREE, {
+                "folder_url": folder_url,
+                "short_name": short_name,
+                "fields": ",".join(fields),
+                "limit": limit,
+            })
+            response = self.client.jenkins_open(requests.Request('GET', url))
+            return _intern_results(json.loads(response).get('builds', [])[:limit])
         job_info = self.client.get_job_info(job_name)
         builds = job_info.get('builds', [])
-        return builds[:limit]
+        return _intern_results(builds[:limit])
 
     def get_build_info(self, job_name: str, build_number: int) -> dict[str, Any]:
         """Get build information."""
@@ -102,10 +142,7 @@ class JenkinsService:
         """Build a job."""
         if not self.client:
             raise ValueError("Jenkins not initialized")
-        if parameters:
-            self.client.build_job(job_name, parameters)
-        else:
-            self.client.build_job(job_name)
+        self.client.build_job(job_name, parameters)
 
     def stop_build(self, job_name: str, build_number: int) -> None:
         """Stop a build."""
@@ -188,15 +225,15 @@ class JenkinsService:
             raise ValueError("Jenkins not initialized")
         
         try:
-            import requests
             import time
             
-            # Use Jenkins credentials for authentication
+            # Use Jenkins credentials over the client's pooled keep-alive session
             auth = (self.username, self.password)
+            session = self.client._session
             
             # Method 1: Try workspace file directly
             workspace_url = f"{self.server_url}/job/{job_name}/ws/{file_path}"
-            response = requests.get(workspace_url, auth=auth, timeout=30)
+            response = session.get(workspace_url, auth=auth, timeout=30)
             
             if response.status_code == 200:
                 logger.info("Successfully retrieved file from workspace")
@@ -205,7 +242,7 @@ class JenkinsService:
             # Method 2: Try last successful build artifacts
             logger.info("Workspace not available, trying last successful build artifacts...")
             artifact_url = f"{self.server_url}/job/{job_name}/lastSuccessfulBuild/artifact/{file_path}"
-            response = requests.get(artifact_url, auth=auth, timeout=30)
+            response = session.get(artifact_url, auth=auth, timeout=30)
             
             if response.status_code == 200:
                 logger.info("Successfully retrieved file from last successful build artifacts")
@@ -214,7 +251,7 @@ class JenkinsService:
             # Method 3: Try last build artifacts
             logger.info("Last successful build not available, trying last build artifacts...")
             artifact_url = f"{self.server_url}/job/{job_name}/lastBuild/artifact/{file_path}"
-            response = requests.get(artifact_url, auth=auth, timeout=30)
+            response = session.get(artifact_url, auth=auth, timeout=30)
             
             if response.status_code == 200:
                 logger.info("Successfully retrieved file from last build artifacts")
@@ -229,7 +266,7 @@ class JenkinsService:
                     # Wait for the build to start and create workspace
                     time.sleep(10)
                     # Try workspace again
-                    response = requests.get(workspace_url, auth=auth, timeout=30)
+                    response = session.get(workspace_url, auth=auth, timeout=30)
                     if response.status_code == 200:
                         logger.info("Successfully retrieved file after triggering build")
                         return response.text
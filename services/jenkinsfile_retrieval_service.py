@@ -1,28 +1,80 @@
 """Comprehensive Jenkinsfile retrieval service for all Jenkins pipeline types."""
 
+import asyncio
+import io
+import json
 import logging
 import re
+import threading
 import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 
 from fastmcp import Context
 
 from services.jenkins_service import JenkinsService
+from utils import ctx_info
 
 logger = logging.getLogger(__name__)
 
+# Job configs rarely change; repeated lookups of the same job within this
+# window reuse one config.xml fetch.
+_CONFIG_CACHE_MAX_SIZE = 64
+_CONFIG_CACHE_TTL_SECONDS = 30.0
+
+# Jobs processed at once when listing every Jenkinsfile; each one may run
+# Groovy on the controller, so the fan-out is kept modest
+_MAX_CONCURRENT_JOBS = 8
+
+# config.xml elements read by the fallbacks
+_SCRIPT_PATH_RE = re.compile(r'<scriptPath>(.*?)</scriptPath>')
+_SCRIPT_RE = re.compile(r'<script>(.*?)</script>', re.DOTALL)
+_PIPELINE_RE = re.compile(r'<pipeline>(.*?)</pipeline>', re.DOTALL)
+_COMMAND_RE = re.compile(r'<command>(.*?)</command>', re.DOTALL)
+
 
 class JenkinsfileRetrievalService:
     """Service for retrieving Jenkinsfiles from all types of Jenkins pipelines."""
 
     def __init__(self, jenkins_service: JenkinsService):
         self.jenkins = jenkins_service
+        self._config_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # Config fetches run in worker threads, so cache updates are serialized
+        self._config_cache_lock = threading.Lock()
+
+    def _cached_get_job_config(self, job_name: str) -> str:
+        """Get a job's config.xml, reusing a fresh cached copy."""
+        with self._config_cache_lock:
+            entry = self._config_cache.get(job_name)
+            if entry is not None and time.monotonic() - entry[0] < _CONFIG_CACHE_TTL_SECONDS:
+                self._config_cache.move_to_end(job_name)
+                return entry[1]
+
+        config = self.jenkins.get_job_config(job_name)
+        with self._config_cache_lock:
+            self._config_cache[job_name] = (time.monotonic(), config)
+            self._config_cache.move_to_end(job_name)
+            if len(self._config_cache) > _CONFIG_CACHE_MAX_SIZE:
+                self._config_cache.popitem(last=False)
+        return config
 
     async def get_jenkinsfile(self, job_name: str, ctx: Context) -> Dict[str, Any]:
         """Get Jenkinsfile for a single pipeline using SCMFileSystem method."""
+        if not job_name:
+            # Rejected up front; both lookups below would only fail after a round-trip
+            return {
+                "job_name": job_name,
+                "content": "Error: Job name is required",
+                "method": "None",
+                "source": "Unknown",
+                "timestamp": datetime.now().isoformat(),
+                "success": False
+            }
+
         try:
-            await ctx.info(f"Getting Jenkinsfile for pipeline: {job_name}")
+            await ctx_info(ctx, logger, "Getting Jenkinsfile for pipeline: %s", job_name)
             
             # Try SCMFileSystem method first (best for Git-based pipelines)
             jenkinsfile_content = await self._get_jenkinsfile_via_scm(job_name, ctx)
@@ -38,7 +90,7 @@ class JenkinsfileRetrievalService:
                 }
             
             # Fallback to config.xml for inline pipelines
-            await ctx.info("SCMFileSystem failed, trying config.xml method...")
+            await ctx_info(ctx, logger, "SCMFileSystem failed, trying config.xml method...")
             config_content = await self._get_jenkinsfile_from_config(job_name, ctx)
             
             if config_content and not config_content.startswith("Error:"):
@@ -73,7 +125,7 @@ class JenkinsfileRetrievalService:
 
     async def get_all_jenkinsfiles(self, ctx: Context) -> Dict[str, Any]:
         """Get Jenkinsfiles from all pipelines in Jenkins."""
-        await ctx.info("🔍 Retrieving Jenkinsfiles from all Jenkins pipelines...")
+        await ctx_info(ctx, logger, "🔍 Retrieving Jenkinsfiles from all Jenkins pipelines...")
         
         if not self.jenkins.is_initialized():
             await ctx.error("Jenkins not initialized. Please configure Jenkins connection first.")
@@ -81,8 +133,8 @@ class JenkinsfileRetrievalService:
 
         try:
             # Get all jobs
-            jobs = self.jenkins.get_jobs()
-            await ctx.info(f"Found {len(jobs)} jobs in Jenkins")
+            jobs = await asyncio.to_thread(self.jenkins.get_jobs)
+            await ctx_info(ctx, logger, "Found %d jobs in Jenkins", len(jobs))
             
             results = {
                 "total_jobs": len(jobs),
@@ -93,52 +145,62 @@ class JenkinsfileRetrievalService:
                 "errors": []
             }
 
-            for job in jobs:
+            slots = asyncio.Semaphore(_MAX_CONCURRENT_JOBS)
+
+            async def process_job(job: Dict[str, Any]) -> tuple[List[Dict[str, Any]], Optional[str]]:
                 job_name = job['name']
                 job_type = job.get('_class', '')
-                
+                found: List[Dict[str, Any]] = []
+
                 try:
-                    await ctx.info(f"Processing job: {job_name} (type: {job_type})")
+                    async with slots:
+                        await ctx_info(ctx, logger, "Processing job: %s (type: %s)", job_name, job_type)
                     
-                    # Determine job type and get appropriate Jenkinsfile
-                    if 'WorkflowJob' in job_type:
-                        # Single pipeline job
-                        results["pipeline_jobs"] += 1
-                        jenkinsfile_data = await self._get_pipeline_jenkinsfile(job_name, ctx)
-                        if jenkinsfile_data:
-                            jenkinsfile_data["job_type"] = "Pipeline"
-                            results["jenkinsfiles"].append(jenkinsfile_data)
+                        # Determine job type and get appropriate Jenkinsfile
+                        if 'WorkflowJob' in job_type:
+                            # Single pipeline job
+                            results["pipeline_jobs"] += 1
+                            jenkinsfile_data = await self._get_pipeline_jenkinsfile(job_name, ctx)
+                            if jenkinsfile_data:
+                                jenkinsfile_data["job_type"] = "Pipeline"
+                                found.append(jenkinsfile_data)
                     
-                    elif 'WorkflowMultiBranchProject' in job_type:
-                        # Multibranch pipeline
-                        results["multibranch_jobs"] += 1
-                        branch_jenkinsfiles = await self._get_multibranch_jenkinsfiles(job_name, ctx)
-                        for branch_data in branch_jenkinsfiles:
-                            branch_data["job_type"] = "Multibranch Pipeline"
-                            results["jenkinsfiles"].append(branch_data)
+                        elif 'WorkflowMultiBranchProject' in job_type:
+                            # Multibranch pipeline
+                            results["multibranch_jobs"] += 1
+                            branch_jenkinsfiles = await self._get_multibranch_jenkinsfiles(job_name, ctx)
+                            for branch_data in branch_jenkinsfiles:
+                                branch_data["job_type"] = "Multibranch Pipeline"
+                                found.append(branch_data)
                     
-                    elif 'FreeStyleProject' in job_type:
-                        # Freestyle job - check if it has pipeline steps
-                        results["freestyle_jobs"] += 1
-                        freestyle_data = await self._get_freestyle_jenkinsfile(job_name, ctx)
-                        if freestyle_data:
-                            freestyle_data["job_type"] = "Freestyle"
-                            results["jenkinsfiles"].append(freestyle_data)
+                        elif 'FreeStyleProject' in job_type:
+                            # Freestyle job - check if it has pipeline steps
+                            results["freestyle_jobs"] += 1
+                            freestyle_data = await self._get_freestyle_jenkinsfile(job_name, ctx)
+                            if freestyle_data:
+                                freestyle_data["job_type"] = "Freestyle"
+                                found.append(freestyle_data)
                     
-                    else:
-                        # Other job types
-                        other_data = await self._get_other_job_jenkinsfile(job_name, ctx)
-                        if other_data:
-                            other_data["job_type"] = "Other"
-                            results["jenkinsfiles"].append(other_data)
-                
+                        else:
+                            # Other job types
+                            other_data = await self._get_other_job_jenkinsfile(job_name, ctx)
+                            if other_data:
+                                other_data["job_type"] = "Other"
+                                found.append(other_data)
                 except Exception as e:
                     error_msg = f"Error processing job {job_name}: {str(e)}"
                     logger.warning(error_msg)
-                    results["errors"].append(error_msg)
                     await ctx.warning(error_msg)
+                    return found, error_msg
+                return found, None
+
+            # Jobs are fetched concurrently but merged back in Jenkins order
+            for found, error_msg in await asyncio.gather(*(process_job(job) for job in jobs)):
+                results["jenkinsfiles"].extend(found)
+                if error_msg:
+                    results["errors"].append(error_msg)
 
-            await ctx.info(f"✅ Successfully processed {len(results['jenkinsfiles'])} Jenkinsfiles")
+            await ctx_info(ctx, logger, "✅ Successfully processed %d Jenkinsfiles", len(results['jenkinsfiles']))
             return results
 
         except Exception as e:
@@ -160,7 +222,7 @@ class JenkinsfileRetrievalService:
                 }
 
             # Method 2: Try workspace file
-            jenkinsfile_content = self.jenkins.get_workspace_file(job_name, "Jenkinsfile", False)
+            jenkinsfile_content = await asyncio.to_thread(self.jenkins.get_workspace_file, job_name, "Jenkinsfile", False)
             if jenkinsfile_content and not jenkinsfile_content.startswith("File not found"):
                 return {
                     "job_name": job_name,
@@ -171,10 +233,11 @@ class JenkinsfileRetrievalService:
                 }
 
             # Method 3: Try config.xml for inline scripts
-            config = self.jenkins.get_job_config(job_name)
-            if 'pipeline' in config.lower() and 'scriptpath' in config.lower():
+            config = await asyncio.to_thread(self._cached_get_job_config, job_name)
+            config_lower = config.lower()
+            if 'pipeline' in config_lower and 'scriptpath' in config_lower:
                 # External Jenkinsfile
-                script_path_match = re.search(r'<scriptPath>(.*?)</scriptPath>', config)
+                script_path_match = _SCRIPT_PATH_RE.search(config)
                 if script_path_match:
                     script_path = script_path_match.group(1)
                     return {
@@ -186,7 +249,7 @@ class JenkinsfileRetrievalService:
                     }
             elif '<script>' in config and '</script>' in config:
                 # Inline script
-                script_match = re.search(r'<script>(.*?)</script>', config, re.DOTALL)
+                script_match = _SCRIPT_RE.search(config)
                 if script_match:
                     return {
                         "job_name": job_name,
@@ -205,7 +268,7 @@ class JenkinsfileRetrievalService:
     async def _get_multibranch_jenkinsfiles(self, job_name: str, ctx: Context) -> List[Dict[str, Any]]:
         """Get Jenkinsfiles from all branches of a multibranch pipeline."""
         try:
-            await ctx.info(f"Processing multibranch pipeline: {job_name}")
+            await ctx_info(ctx, logger, "Processing multibranch pipeline: %s", job_name)
             
             # Use proven Groovy script to get all branches and their Jenkinsfiles
             groovy_script = f"""
@@ -271,7 +334,7 @@ results.each {{ result ->
 println "=== MULTIBRANCH_RESULTS_END ==="
 """
 
-            result = self.jenkins.execute_groovy_script(groovy_script)
+            result = await asyncio.to_thread(self.jenkins.execute_groovy_script, groovy_script)
             
             # Parse the structured result
             branches = self._parse_multibranch_results(result)
@@ -289,7 +352,7 @@ println "=== MULTIBRANCH_RESULTS_END ==="
                     "error": branch.get('error')
                 })
             
-            await ctx.info(f"Found {len(jenkinsfiles)} branches in multibranch pipeline")
+            await ctx_info(ctx, logger, "Found %d branches in multibranch pipeline", len(jenkinsfiles))
             return jenkinsfiles
 
         except Exception as e:
@@ -307,12 +370,14 @@ println "=== MULTIBRANCH_RESULTS_END ==="
     async def _get_freestyle_jenkinsfile(self, job_name: str, ctx: Context) -> Optional[Dict[str, Any]]:
         """Get pipeline content from a freestyle job (if it has pipeline steps)."""
         try:
-            config = self.jenkins.get_job_config(job_name)
+            config = await asyncio.to_thread(self._cached_get_job_config, job_name)
             
+            config_lower = config.lower()
+
             # Check if it has pipeline steps
-            if 'pipeline' in config.lower() or 'workflow' in config.lower():
+            if 'pipeline' in config_lower or 'workflow' in config_lower:
                 # Extract any pipeline-related content
-                pipeline_match = re.search(r'<pipeline>(.*?)</pipeline>', config, re.DOTALL)
+                pipeline_match = _PIPELINE_RE.search(config)
                 if pipeline_match:
                     return {
                         "job_name": job_name,
@@ -323,10 +388,11 @@ println "=== MULTIBRANCH_RESULTS_END ==="
                     }
             
             # Check for shell scripts that might contain pipeline-like content
-            shell_matches = re.findall(r'<command>(.*?)</command>', config, re.DOTALL)
+            shell_matches = _COMMAND_RE.findall(config)
             if shell_matches:
                 pipeline_content = "\n".join(shell_matches)
-                if any(keyword in pipeline_content.lower() for keyword in ['pipeline', 'stage', 'node', 'workflow']):
+                content_lower = pipeline_content.lower()
+                if any(keyword in content_lower for keyword in ('pipeline', 'stage', 'node', 'workflow')):
                     return {
                         "job_name": job_name,
                         "content": f"# Freestyle Job with Pipeline-like Content\n# Shell Commands:\n{pipeline_content}",
@@ -344,10 +410,11 @@ println "=== MULTIBRANCH_RESULTS_END ==="
     async def _get_other_job_jenkinsfile(self, job_name: str, ctx: Context) -> Optional[Dict[str, Any]]:
         """Get pipeline content from other job types."""
         try:
-            config = self.jenkins.get_job_config(job_name)
+            config = await asyncio.to_thread(self._cached_get_job_config, job_name)
             
             # Look for any pipeline-related content in the config
-            if any(keyword in config.lower() for keyword in ['pipeline', 'workflow', 'jenkinsfile']):
+            config_lower = config.lower()
+            if any(keyword in config_lower for keyword in ('pipeline', 'workflow', 'jenkinsfile')):
                 return {
                     "job_name": job_name,
                     "content": f"# Job Configuration (contains pipeline references)\n{config}",
@@ -365,26 +432,15 @@ println "=== MULTIBRANCH_RESULTS_END ==="
     async def _get_jenkinsfile_from_config(self, job_name: str, ctx: Context) -> str:
         """Get Jenkinsfile from config.xml for inline pipelines."""
         try:
-            await ctx.info(f"Getting Jenkinsfile from config.xml for {job_name}")
+            await ctx_info(ctx, logger, "Getting Jenkinsfile from config.xml for %s", job_name)
             
             # Get job config
-            config_xml = self.jenkins_service.get_job_config(job_name)
-            
-            # Parse XML to extract pipeline script
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(config_xml)
-            
-            # Look for pipeline script in different locations
-            script_elements = root.findall(".//script")
-            if script_elements:
-                return script_elements[0].text or ""
+            config_xml = await asyncio.to_thread(self._cached_get_job_config, job_name)
             
-            # Look for definition/script
-            definition = root.find(".//definition")
-            if definition is not None:
-                script_elem = definition.find("script")
-                if script_elem is not None:
-                    return script_elem.text or ""
+            # Stream the XML and stop at the first pipeline script (definition/script included)
+            for _, element in ET.iterparse(io.StringIO(config_xml)):
+                if element.tag == "script":
+                    return element.text or ""
             
             return "Error: No pipeline script found in config.xml"
             
@@ -423,7 +479,7 @@ if (scms && scms.size() > 0) {{
 }}
 """
 
-            result = self.jenkins.execute_groovy_script(groovy_script)
+            result = await asyncio.to_thread(self.jenkins.execute_groovy_script, groovy_script)
             
             # Parse the result to extract Jenkinsfile content
             if "=== JENKINSFILE_CONTENT_START ===" in result and "=== JENKINSFILE_CONTENT_END ===" in result:
@@ -508,8 +564,11 @@ if (scms && scms.size() > 0) {{
 
     async def get_jenkinsfile_for_specific_build(self, job_name: str, build_number: int, ctx: Context) -> Dict[str, Any]:
         """Get the exact Jenkinsfile used by a specific build."""
-        await ctx.info(f"Getting Jenkinsfile for {job_name} build #{build_number}")
-        
+        if not job_name or build_number < 1:
+            return {"error": "A job name and a positive build number are required"}
+
+        await ctx_info(ctx, logger, "Getting Jenkinsfile for %s build #%s", job_name, build_number)
+
         if not self.jenkins.is_initialized():
             await ctx.error("Jenkins not initialized. Please configure Jenkins connection first.")
             return {"error": "Jenkins not initialized"}
@@ -558,10 +617,9 @@ if (scms && scms.size() > 0) {{
             }}
             """
 
-            result = self.jenkins.execute_groovy_script(groovy_script)
+            result = await asyncio.to_thread(self.jenkins.execute_groovy_script, groovy_script)
             
             # Parse the result
-            import json
             try:
                 if isinstance(result, str):
                     build_data = json.loads(result)
@@ -613,14 +671,14 @@ if (scms && scms.size() > 0) {{
 
     async def get_pipeline_types_summary(self, ctx: Context) -> Dict[str, Any]:
         """Get a summary of all pipeline types and their Jenkinsfile availability."""
-        await ctx.info("📊 Analyzing pipeline types and Jenkinsfile availability...")
+        await ctx_info(ctx, logger, "📊 Analyzing pipeline types and Jenkinsfile availability...")
         
         if not self.jenkins.is_initialized():
             await ctx.error("Jenkins not initialized. Please configure Jenkins connection first.")
             return {"error": "Jenkins not initialized"}
 
         try:
-            jobs = self.jenkins.get_jobs()
+            jobs = await asyncio.to_thread(self.jenkins.get_jobs)
             
             summary = {
                 "total_jobs": len(jobs),
@@ -639,59 +697,67 @@ if (scms && scms.size() > 0) {{
                 "errors": []
             }
 
-            for job in jobs:
+            slots = asyncio.Semaphore(_MAX_CONCURRENT_JOBS)
+
+            async def analyze_job(job: Dict[str, Any]) -> Optional[str]:
                 job_name = job['name']
                 job_type = job.get('_class', '')
-                
+
                 try:
-                    if 'WorkflowJob' in job_type:
-                        summary["pipeline_types"]["Pipeline"]["count"] += 1
-                        jenkinsfile_data = await self._get_pipeline_jenkinsfile(job_name, ctx)
-                        if jenkinsfile_data:
-                            summary["pipeline_types"]["Pipeline"]["with_jenkinsfile"] += 1
-                            source = jenkinsfile_data.get("source", "Unknown")
-                            if "Git" in source:
-                                summary["jenkinsfile_sources"]["Git Repository"] += 1
-                            elif "Inline" in source:
-                                summary["jenkinsfile_sources"]["Inline Script"] += 1
-                            elif "Workspace" in source:
-                                summary["jenkinsfile_sources"]["Workspace"] += 1
-                        else:
-                            summary["jenkinsfile_sources"]["Not Available"] += 1
+                    async with slots:
+                        if 'WorkflowJob' in job_type:
+                            summary["pipeline_types"]["Pipeline"]["count"] += 1
+                            jenkinsfile_data = await self._get_pipeline_jenkinsfile(job_name, ctx)
+                            if jenkinsfile_data:
+                                summary["pipeline_types"]["Pipeline"]["with_jenkinsfile"] += 1
+                                source = jenkinsfile_data.get("source", "Unknown")
+                                if "Git" in source:
+                                    summary["jenkinsfile_sources"]["Git Repository"] += 1
+                                elif "Inline" in source:
+                                    summary["jenkinsfile_sources"]["Inline Script"] += 1
+                                elif "Workspace" in source:
+                                    summary["jenkinsfile_sources"]["Workspace"] += 1
+                            else:
+                                summary["jenkinsfile_sources"]["Not Available"] += 1
                     
-                    elif 'WorkflowMultiBranchProject' in job_type:
-                        summary["pipeline_types"]["Multibranch Pipeline"]["count"] += 1
-                        branch_jenkinsfiles = await self._get_multibranch_jenkinsfiles(job_name, ctx)
-                        if branch_jenkinsfiles and any(not bf.get('error') for bf in branch_jenkinsfiles):
-                            summary["pipeline_types"]["Multibranch Pipeline"]["with_jenkinsfile"] += 1
-                            summary["jenkinsfile_sources"]["Git Repository"] += len([bf for bf in branch_jenkinsfiles if not bf.get('error')])
-                        else:
-                            summary["jenkinsfile_sources"]["Not Available"] += 1
+                        elif 'WorkflowMultiBranchProject' in job_type:
+                            summary["pipeline_types"]["Multibranch Pipeline"]["count"] += 1
+                            branch_jenkinsfiles = await self._get_multibranch_jenkinsfiles(job_name, ctx)
+                            if branch_jenkinsfiles and any(not bf.get('error') for bf in branch_jenkinsfiles):
+                                summary["pipeline_types"]["Multibranch Pipeline"]["with_jenkinsfile"] += 1
+                                summary["jenkinsfile_sources"]["Git Repository"] += sum(1 for bf in branch_jenkinsfiles if not bf.get('error'))
+                            else:
+                                summary["jenkinsfile_sources"]["Not Available"] += 1
                     
-                    elif 'FreeStyleProject' in job_type:
-                        summary["pipeline_types"]["Freestyle"]["count"] += 1
-                        freestyle_data = await self._get_freestyle_jenkinsfile(job_name, ctx)
-                        if freestyle_data:
-                            summary["pipeline_types"]["Freestyle"]["with_jenkinsfile"] += 1
-                            summary["jenkinsfile_sources"]["Inline Script"] += 1
-                        else:
-                            summary["jenkinsfile_sources"]["Not Available"] += 1
+                        elif 'FreeStyleProject' in job_type:
+                            summary["pipeline_types"]["Freestyle"]["count"] += 1
+                            freestyle_data = await self._get_freestyle_jenkinsfile(job_name, ctx)
+                            if freestyle_data:
+                                summary["pipeline_types"]["Freestyle"]["with_jenkinsfile"] += 1
+                                summary["jenkinsfile_sources"]["Inline Script"] += 1
+                            else:
+                                summary["jenkinsfile_sources"]["Not Available"] += 1
                     
-                    else:
-                        summary["pipeline_types"]["Other"]["count"] += 1
-                        other_data = await self._get_other_job_jenkinsfile(job_name, ctx)
-                        if other_data:
-                            summary["pipeline_types"]["Other"]["with_jenkinsfile"] += 1
-                            summary["jenkinsfile_sources"]["Inline Script"] += 1
                         else:
-                            summary["jenkinsfile_sources"]["Not Available"] += 1
-                
+                            summary["pipeline_types"]["Other"]["count"] += 1
+                            other_data = await self._get_other_job_jenkinsfile(job_name, ctx)
+                            if other_data:
+                                summary["pipeline_types"]["Other"]["with_jenkinsfile"] += 1
+                                summary["jenkinsfile_sources"]["Inline Script"] += 1
+                            else:
+                                summary["jenkinsfile_sources"]["Not Available"] += 1
                 except Exception as e:
                     error_msg = f"Error analyzing job {job_name}: {str(e)}"
-                    summary["errors"].append(error_msg)
                     logger.warning(error_msg)
+                    return error_msg
+                return None
+
+            # Counters are plain increments between awaits, so concurrent jobs cannot race on them
+            for error_msg in await asyncio.gather(*(analyze_job(job) for job in jobs)):
+                if error_msg:
+                    summary["errors"].append(error_msg)
 
-            await ctx.info("✅ Pipeline types analysis completed")
+            await ctx_info(ctx, logger, "✅ Pipeline types analysis completed")
             return summary
 
         except Exception as e:
@@ -43,9 +43,9 @@ class MonitoringTools:
 
             # Calculate metrics
             total_builds = len(recent_builds)
-            successful_builds = len([b for b in recent_builds if b.get("result") == "SUCCESS"])
-            failed_builds = len([b for b in recent_builds if b.get("result") == "FAILURE"])
-            unstable_builds = len([b for b in recent_builds if b.get("result") == "UNSTABLE"])
+            successful_builds = sum(1 for b in recent_builds if b.get("result") == "SUCCESS")
+            failed_builds = sum(1 for b in recent_builds if b.get("result") == "FAILURE")
+            unstable_builds = sum(1 for b in recent_builds if b.get("result") == "UNSTABLE")
 
             success_rate = (successful_builds / total_builds) * 100 if total_builds > 0 else 0
             failure_rate = (failed_builds / total_builds) * 100 if total_builds > 0 else 0
@@ -198,8 +198,8 @@ class MonitoringTools:
                         recent_builds.append(b)
 
                 if recent_builds:
-                    successful = len([b for b in recent_builds if b.get("result") == "SUCCESS"])
-                    failed = len([b for b in recent_builds if b.get("result") == "FAILURE"])
+                    successful = sum(1 for b in recent_builds if b.get("result") == "SUCCESS")
+                    failed = sum(1 for b in recent_builds if b.get("result") == "FAILURE")
 
                     all_metrics.append({
                         "pipeline_name": pipeline_name,
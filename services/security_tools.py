@@ -69,9 +69,9 @@ class SecurityTools:
                 "pipeline_name": pipeline_name,
                 "security_score": max(security_score, 0),
                 "total_issues": len(security_issues),
-                "high_severity": len([i for i in security_issues if i["severity"] == "HIGH"]),
-                "medium_severity": len([i for i in security_issues if i["severity"] == "MEDIUM"]),
-                "low_severity": len([i for i in security_issues if i["severity"] == "LOW"]),
+                "high_severity": sum(1 for i in security_issues if i["severity"] == "HIGH"),
+                "medium_severity": sum(1 for i in security_issues if i["severity"] == "MEDIUM"),
+                "low_severity": sum(1 for i in security_issues if i["severity"] == "LOW"),
                 "issues": security_issues,
                 "scan_date": datetime.now().isoformat()
             }
@@ -0,0 +1,16 @@
+"""Tests for sensitive data detection in the advanced security tools."""
+
+import pytest
+
+from services.advanced_security_tools import AdvancedSecurityTools
+
+
+@pytest.mark.parametrize("text, value", [
+    ("ſecret=abcdefghijklmnop", "abcdefghijklmnop"),  # long s, casefolds to 's'
+    ("apıkey=abcdefghijklmnop", "abcdefghijklmnop"),  # dotless i, casefold keeps it
+])
+def test_detect_sensitive_data_unicode_case_variant_trigger(text, value):
+    protected = AdvancedSecurityTools(None)._detect_sensitive_data(text)
+
+    assert value not in protected
+    assert "_HASH_" in protected
@@ -4,6 +4,7 @@ from .helpers import (
     analyze_issues,
     analyze_root_cause,
     answer_question,
+    ctx_info,
     determine_priority,
     determine_trend,
     extract_error_message,
@@ -11,10 +12,12 @@ from .helpers import (
     format_duration_seconds,
     generate_suggested_fixes,
     parse_timestamp,
+    parse_timestamp_epoch,
 )
 
 __all__ = [
     "parse_timestamp",
+    "parse_timestamp_epoch",
     "determine_trend",
     "analyze_issues",
     "extract_error_message",
@@ -23,5 +26,6 @@ __all__ = [
     "analyze_root_cause",
     "answer_question",
     "format_duration",
-    "format_duration_seconds"
+    "format_duration_seconds",
+    "ctx_info"
 ]
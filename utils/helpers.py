@@ -1,6 +1,8 @@
 """Helper functions for pipeline analysis."""
 
+import logging
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
 
@@ -25,6 +27,26 @@ def parse_timestamp(timestamp: int | None) -> datetime | None:
         return None
 
 
+@lru_cache(maxsize=4096)
+def parse_timestamp_epoch(timestamp: int | float | str | None) -> float | None:
+    """Parse a Jenkins timestamp (milliseconds or ISO-8601 string) to epoch seconds."""
+    if not timestamp:
+        return None
+
+    try:
+        if isinstance(timestamp, str):
+            return datetime.fromisoformat(timestamp).timestamp()
+        # Same seconds/milliseconds heuristic as parse_timestamp
+        if timestamp < 1000000000:
+            return float(timestamp)
+        return timestamp / 1000
+    except (ValueError, TypeError, OSError) as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.warning(f"Failed to parse timestamp {timestamp}: {e}")
+        return None
+
+
 def format_duration(duration_ms: int | None) -> str:
     """Format Jenkins build duration from milliseconds to human-readable format."""
     if not duration_ms or duration_ms <= 0:
@@ -63,8 +85,8 @@ def determine_trend(builds: list[dict[str, Any]]) -> str:
     first_half = builds[:mid_point]
     second_half = builds[mid_point:]
 
-    first_success_rate = len([b for b in first_half if b.get("result") == "SUCCESS"]) / len(first_half)
-    second_success_rate = len([b for b in second_half if b.get("result") == "SUCCESS"]) / len(second_half)
+    first_success_rate = sum(1 for b in first_half if b.get("result") == "SUCCESS") / len(first_half)
+    second_success_rate = sum(1 for b in second_half if b.get("result") == "SUCCESS") / len(second_half)
 
     if second_success_rate > first_success_rate + 0.1:
         return "improving"
@@ -200,3 +222,12 @@ def answer_question(question: str, pipelines: list[Any]) -> tuple[str, float, li
         sources = ["general_analysis"]
 
     return answer, confidence, sources
+
+
+async def ctx_info(ctx: Any, logger: logging.Logger, fmt: str, *args: Any) -> None:
+    """Send a progress message to the client unless INFO logging is disabled for the caller's logger.
+
+    Formatting is deferred so disabled messages cost neither the string nor the await.
+    """
+    if logger.isEnabledFor(logging.INFO):
+        await ctx.info(fmt % args if args else fmt)
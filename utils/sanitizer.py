@@ -0,0 +1,193 @@
+"""Sensitive data masking shared by the pipeline tools.
+
+Values that identify secrets, hosts or internal names are replaced with short hashed
+placeholders before data is handed to an AI client; the real values stay local.
+"""
+
+import hashlib
+import logging
+import re
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+try:
+    import hyperscan
+except ImportError:  # optional speedup
+    hyperscan = None
+
+logger = logging.getLogger(__name__)
+
+# Patterns for sensitive data
+SENSITIVE_PATTERNS = {
+    name: re.compile(pattern)
+    for name, pattern in {
+        'password': r'(?i)(password|passwd|pwd)\s*+[:=]\s*+["\']?([^"\'\s]{3,})["\']?',
+        'token': r'(?i)(token|bearer|api[_-]?key)\s*+[:=]\s*+["\']?([a-zA-Z0-9._-]{10,})["\']?',
+        'secret': r'(?i)(secret|key)\s*+[:=]\s*+["\']?([a-zA-Z0-9._-]{10,})["\']?',
+        'email': r'\b[A-Za-z0-9._%+-]++@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+        'ip': r'\b(?:[0-9]{1,3}+\.){3}[0-9]{1,3}+\b',
+        'url': r'https?://[^\s<>"{}|\\^`\[\]]+',
+        'pipeline_name': r'\b(?:pipeline|job|build)[_-]?name\s*+[:=]\s*+["\']?([a-zA-Z0-9._-]{3,})["\']?',
+        'cluster_name': r'\b(?:cluster|eks|gke|aks)[_-]?name\s*+[:=]\s*+["\']?([a-zA-Z0-9._-]{3,})["\']?',
+        'environment': r'\b(?:env|environment)\s*+[:=]\s*+["\']?(prod|production|staging|stage|dev|development|test|qa|uat)["\']?',
+        'project_name': r'\b(?:project|repo|repository)[_-]?name\s*+[:=]\s*+["\']?([a-zA-Z0-9._-]{3,})["\']?',
+        'namespace': r'\b(?:namespace|ns)\s*+[:=]\s*+["\']?([a-zA-Z0-9._-]{3,})["\']?',
+        'service_name': r'\b(?:service|svc)[_-]?name\s*+[:=]\s*+["\']?([a-zA-Z0-9._-]{3,})["\']?',
+        'user_name': r'\b(?:user|username)[_-]?name\s*+[:=]\s*+["\']?([a-zA-Z0-9._-]{3,})["\']?',
+        'team_name': r'\b(?:team|group)[_-]?name\s*+[:=]\s*+["\']?([a-zA-Z0-9._-]{3,})["\']?',
+        'company_name': r'\b(?:company|org|organization)[_-]?name\s*+[:=]\s*+["\']?([a-zA-Z0-9._-]{3,})["\']?',
+    }.items()
+}
+
+# Common naming patterns that might contain sensitive information
+NAME_PATTERNS = {
+    name: re.compile(pattern)
+    for name, pattern in {
+        'pipeline_name': r'\b(?:eks|gke|aks|k8s|kube)[-_]?[a-zA-Z0-9]{2,}+\b',  # eks-prod, gke-staging, etc.
+        'cluster_name': r'\b(?:cluster|eks|gke|aks)[-_]?[a-zA-Z0-9]{2,}+\b',  # cluster-prod, eks-dev, etc.
+        'environment_name': r'\b(?:prod|production|staging|stage|dev|development|test|qa|uat)[-_]?[a-zA-Z0-9]{0,}\b',
+        'project_name': r'\b(?:project|repo|app)[-_]?[a-zA-Z0-9]{2,}+\b',  # project-abc, repo-xyz, etc.
+        'service_name': r'\b(?:svc|service)[-_]?[a-zA-Z0-9]{2,}+\b',  # svc-api, service-web, etc.
+        'team_name': r'\b(?:team|group)[-_]?[a-zA-Z0-9]{2,}+\b',  # team-devops, group-backend, etc.
+        'company_name': r'\b(?:company|org|corp)[-_]?[a-zA-Z0-9]{2,}+\b',  # company-abc, org-xyz, etc.
+        'folder_name': r'\b(?:folder|dir|directory)[-_]?[a-zA-Z0-9]{2,}+\b',  # folder-abc, dir-xyz, etc.
+        'app_name': r'\b(?:app|application)[-_]?[a-zA-Z0-9]{2,}+\b',  # app-web, application-api, etc.
+        'branch_name': r'\b(?:branch|br)[-_]?[a-zA-Z0-9]{2,}+\b',  # branch-feature, br-main, etc.
+        'org_name': r'\b(?:org|organization)[-_]?[a-zA-Z0-9]{2,}+\b',  # org-company, organization-abc, etc.
+        'repo_name': r'\b(?:repo|repository)[-_]?[a-zA-Z0-9]{2,}+\b',  # repo-backend, repository-frontend, etc.
+        'file_name': r'\b(?:file|src|lib)[-_]?[a-zA-Z0-9]{2,}+\.(?:py|js|ts|java|go|rs|cpp|c|h|hpp|cs|php|rb|swift|kt|scala|sh|bash|ps1|yaml|yml|json|xml|html|css|sql|md|txt)\b',  # file-utils.py, src-main.js, etc.
+    }.items()
+}
+
+
+@lru_cache(maxsize=4096)
+def hash8(value: str) -> str:
+    """Short SHA-256 digest used in placeholders; the same values recur across reports and console logs."""
+    return hashlib.sha256(value.encode()).hexdigest()[:8]
+
+
+def build_scanner(*tables: dict[str, re.Pattern]) -> tuple[re.Pattern, Callable[[re.Match], str]]:
+    """Fuse pattern tables into one alternation and return it with its hashing replacement function.
+
+    Each pattern becomes one outer group; match.lastindex identifies the pattern that
+    matched. Patterns with two or more groups hash their second group, others the whole match.
+    """
+    alternatives = []
+    targets = {}
+    group_index = 1
+    for table in tables:
+        for pattern_name, pattern in table.items():
+            source = pattern.pattern
+            if source.startswith('(?i)'):
+                source = f'(?i:{source[4:]})'
+            alternatives.append(f'({source})')
+            targets[group_index] = (pattern_name.upper(), group_index + 2 if pattern.groups > 1 else group_index)
+            group_index += pattern.groups + 1
+
+    def replace(match: re.Match) -> str:
+        label, value_group = targets[match.lastindex]
+        # Create a hash for AI communication
+        placeholder = f"[{label}_HASH_{hash8(match.group(value_group))}]"
+        if value_group == match.lastindex:
+            return placeholder
+        text = match.string
+        return text[match.start():match.start(value_group)] + placeholder + text[match.end(value_group):match.end()]
+
+    return re.compile('|'.join(alternatives)), replace
+
+
+SENSITIVE_SCANNER, hash_sensitive = build_scanner(SENSITIVE_PATTERNS)
+NAME_SCANNER, hash_name = build_scanner(NAME_PATTERNS)
+
+# The '+' that makes a preceding quantifier possessive
+POSSESSIVE_SUFFIX = re.compile(r'(?<=[*+}])\+')
+
+# Every identifying-name pattern starts with a word boundary and one of these literals,
+# so text without any of them cannot contain a name match.
+NAME_PREFIXES = (
+    'eks', 'gke', 'aks', 'k8s', 'kube', 'cluster', 'prod', 'production', 'staging', 'stage',
+    'dev', 'development', 'test', 'qa', 'uat', 'project', 'repo', 'app', 'svc', 'service',
+    'team', 'group', 'company', 'org', 'corp', 'folder', 'dir', 'directory', 'application',
+    'branch', 'br', 'organization', 'repository', 'file', 'src', 'lib',
+)
+NAME_PREFIX_REGEX = re.compile(r'\b(?:' + '|'.join(map(re.escape, NAME_PREFIXES)) + ')')
+
+
+def protect_identifying_names(text: str) -> str:
+    """Protect identifying names like pipeline names, cluster names, etc."""
+    if not text:
+        return text
+
+    if not NAME_PREFIX_REGEX.search(text):
+        return text
+
+    return NAME_SCANNER.sub(hash_name, text)
+
+
+def _hyperscan_source(pattern: re.Pattern) -> bytes:
+    """Translate a pattern for the Hyperscan prefilter.
+
+    Hyperscan has no possessive quantifiers; dropping them only widens what matches, which
+    is safe for a prefilter. Python's \\s also matches the ASCII separator controls.
+    """
+    source = POSSESSIVE_SUFFIX.sub('', pattern.pattern)
+    return source.replace(r'\s*', r'[\s\x1c-\x1f]*').encode()
+
+
+def _build_prefilter(*tables: dict[str, re.Pattern]) -> Callable[[str], bool] | None:
+    """Compile every pattern into one Hyperscan database that tells whether any of them can match.
+
+    Hyperscan reports no capture groups, so it only decides whether the re scanners need to
+    run at all. Its word-boundary and whitespace classes are ASCII-only; they agree with re on
+    ASCII text once whitespace also admits the ASCII separator controls, so non-ASCII text is
+    always handed to re.
+    """
+    if hyperscan is None:
+        return None
+
+    patterns = [pattern for table in tables for pattern in table.values()]
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[_hyperscan_source(pattern) for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns),
+        )
+    except hyperscan.error as e:
+        logger.warning(f"Hyperscan prefilter unavailable, using re only: {e}")
+        return None
+
+    def stop_scan(*_args: Any) -> bool:
+        return True
+
+    def may_match(text: str) -> bool:
+        if not text.isascii():
+            return True
+        try:
+            database.scan(text.encode('ascii'), match_event_handler=stop_scan)
+        except hyperscan.ScanTerminated:
+            return True
+        return False
+
+    return may_match
+
+
+# Built once for every caller of detect_sensitive_data
+_may_contain_sensitive = _build_prefilter(SENSITIVE_PATTERNS, NAME_PATTERNS)
+
+
+def detect_sensitive_data(text: str) -> str:
+    """Detect and hash sensitive data for AI communication while keeping real data locally."""
+    if not text:
+        return text
+
+    # Skip both scanners when a single Hyperscan pass rules out every pattern
+    if _may_contain_sensitive is not None and not _may_contain_sensitive(text):
+        return text
+
+    protected_text = SENSITIVE_SCANNER.sub(hash_sensitive, text)
+
+    # Also protect identifying names
+    return protect_identifying_names(protected_text)